@@ -0,0 +1,181 @@
+"""Module implementing hot-reloading catalogs of quotes and images."""
+from threading import Event, Lock, Thread
+import os
+import time
+import logging
+from QuoteEngine.Ingestor import Ingestor
+from QuoteEngine.QuoteIndex import QuoteIndex
+from ImageCatalog import ImageCatalog
+
+
+class CatalogSnapshot:
+    """
+    An immutable view of the quotes and images at one point in time.
+
+    Attributes:
+        quotes (Sequence[QuoteModel]): All quotes of the quote files.
+        imgs (list): Paths of all base images.
+        version (int): Increases by one with every reload.
+        loaded_at (float): UNIX timestamp of the reload.
+    """
+
+    def __init__(self, quotes, imgs: list, version: int) -> None:
+        """
+        Create a CatalogSnapshot object instance.
+
+        Args:
+            quotes (Sequence[QuoteModel]): All quotes of the quote files.
+            imgs (list): Paths of all base images.
+            version (int): The version of the catalog.
+        """
+        self.quotes = quotes
+        self.imgs = imgs
+        self.version = version
+        self.loaded_at = time.time()
+
+
+class Catalog:
+    """
+    Watches the quote and image directories and reloads what changed.
+
+    Requests read `snapshot` once and use it throughout, while reloads
+    build a new snapshot on the side and swap it in with one assignment,
+    so in-flight requests are never blocked or see a half-built catalog.
+    Quote files are re-ingested incrementally through the `QuoteIndex`,
+    so only files that changed are parsed again, and images through the
+    `ImageCatalog`, so only new or changed images are opened again.
+    Attributes:
+        quotes_path (str): The directory of quote files.
+        images_path (str): The directory of base images.
+        images (ImageCatalog): The index of base images.
+        snapshot (CatalogSnapshot): The current catalog.
+        reloads (int): Number of reloads performed.
+        last_reload_seconds (float): Duration of the last reload.
+        last_reparsed (list): Quote files parsed by the last reload.
+    """
+
+    def __init__(self, quotes_path: str, images_path: str,
+                 index: QuoteIndex = None, images: ImageCatalog = None,
+                 interval: float = 5) -> None:
+        """
+        Create a Catalog object instance and load it.
+
+        Args:
+            quotes_path (str): The directory of quote files.
+            images_path (str): The directory of base images.
+            index (QuoteIndex): The quote index to load quotes through.
+                Defaults to a QuoteIndex at its default location.
+            images (ImageCatalog): The index of base images.
+                Defaults to an ImageCatalog of images_path.
+            interval (float): Seconds between checks for changes.
+                Defaults to 5.
+        """
+        self.quotes_path = quotes_path
+        self.images_path = images_path
+        self.index = index or QuoteIndex()
+        self.images = images or ImageCatalog(images_path)
+        self.interval = interval
+        self.snapshot = None
+        self.reloads = 0
+        self.last_reload_seconds = 0.0
+        self.last_reparsed = []
+        self._signature = None
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self.reload()
+
+    def quote_files(self) -> list:
+        """
+        List the ingestible quote files, in a stable order.
+
+        Returns:
+            list: Paths of the quote files in quotes_path.
+        """
+        return Ingestor.list_files(self.quotes_path)
+
+    def _stat_signature(self, paths: list) -> tuple:
+        """Return the paths with their modification time and size."""
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the catalog if any quote file or image changed.
+
+        Args:
+            force (bool): Rebuild even if nothing changed. Default False.
+
+        Returns:
+            bool: True if a new snapshot was swapped in.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            quote_files = self.quote_files()
+            signature = self._stat_signature(quote_files)
+            images_changed = self.images.refresh()
+            if not force and not images_changed and \
+                    signature == self._signature:
+                return False
+
+            if force or signature != self._signature:
+                quotes = self.index.load(quote_files)
+                self.last_reparsed = list(self.index.reparsed)
+            else:
+                quotes = self.snapshot.quotes
+                self.last_reparsed = []
+            version = self.snapshot.version + 1 if self.snapshot else 1
+            self.snapshot = CatalogSnapshot(
+                quotes, self.images.paths(), version)
+
+            self._signature = signature
+            self.reloads += 1
+            self.last_reload_seconds = time.perf_counter() - start
+            return True
+
+    def _loop(self) -> None:
+        """Check for changes until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logging.error(f"Catalog reload failed: {str(e)}")
+
+    def start(self) -> None:
+        """Start watching for changes in a background daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._loop, name='catalog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        """
+        Return the catalog version and reload timings.
+
+        Returns:
+            dict: The version, sizes, reload count and timings.
+        """
+        snapshot = self.snapshot
+        return {
+            'version': snapshot.version,
+            'loaded_at': snapshot.loaded_at,
+            'quotes': len(snapshot.quotes),
+            'images': len(snapshot.imgs),
+            'reloads': self.reloads,
+            'last_reload_seconds': self.last_reload_seconds,
+            'last_reparsed': self.last_reparsed,
+        }
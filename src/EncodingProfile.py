@@ -0,0 +1,218 @@
+"""Module implementing output encoding profiles for meme images."""
+from io import BytesIO
+
+FORMATS = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'WEBP': ('webp', 'image/webp'),
+    'PNG': ('png', 'image/png'),
+    'GIF': ('gif', 'image/gif'),
+}
+LOSSY_FORMATS = ('JPEG', 'WEBP')
+ANIMATED_FORMATS = ('WEBP', 'GIF')
+
+
+class EncodingProfile:
+    """
+    How a rendered meme is encoded: format, quality and encoder flags.
+
+    With a target size, a lossy profile searches for the highest quality
+    between min_quality and quality whose output still fits the target.
+    Attributes:
+        format (str): The Pillow format name, 'JPEG', 'WEBP', 'PNG' or
+            'GIF'.
+        quality (int): The quality of lossy formats, 1 to 100.
+        progressive (bool): Write progressive JPEGs.
+        optimize (bool): Optimize the Huffman tables of a JPEG or the
+            compression of a PNG or GIF, at the cost of encode time.
+        method (int): The WebP encoder effort, 0 (fast) to 6 (small).
+        target_bytes (int or None): The size the output should fit in.
+        min_quality (int): The lowest quality tried to reach the target.
+    """
+
+    def __init__(self, format: str = 'JPEG', quality: int = 75,
+                 progressive: bool = False, optimize: bool = False,
+                 method: int = 4, target_bytes: int = None,
+                 min_quality: int = 30) -> None:
+        """
+        Create an EncodingProfile object instance.
+
+        Args:
+            format (str): 'JPEG', 'WEBP', 'PNG' or 'GIF'.
+                Defaults to 'JPEG'.
+            quality (int): The quality of lossy formats. Defaults to 75.
+            progressive (bool): Write progressive JPEGs. Default False.
+            optimize (bool): Spend more time for smaller JPEGs, PNGs and
+                GIFs.
+                Defaults to False.
+            method (int): The WebP encoder effort. Defaults to 4.
+            target_bytes (int): The size the output should fit in.
+                Defaults to None, meaning quality is used as is.
+            min_quality (int): The lowest quality tried to reach
+                target_bytes. Defaults to 30.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        format = format.upper()
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported output format {format}")
+        self.format = format
+        self.quality = quality
+        self.progressive = progressive
+        self.optimize = optimize
+        self.method = method
+        self.target_bytes = target_bytes
+        self.min_quality = min(min_quality, quality)
+
+    @property
+    def extension(self) -> str:
+        """Return the file extension of the format, without the dot."""
+        return FORMATS[self.format][0]
+
+    @property
+    def mimetype(self) -> str:
+        """Return the media type of the format."""
+        return FORMATS[self.format][1]
+
+    def key(self) -> str:
+        """
+        Return a string identifying every option that changes the output.
+
+        Returns:
+            str: The options, suitable as part of a meme key.
+        """
+        return (f"{self.format}:q{self.quality}:p{int(self.progressive)}:"
+                f"o{int(self.optimize)}:m{self.method}:"
+                f"t{self.target_bytes}:min{self.min_quality}")
+
+    def save_options(self, quality: int) -> dict:
+        """
+        Return the keyword arguments of `Image.save` for this profile.
+
+        Args:
+            quality (int): The quality to encode lossy formats at.
+
+        Returns:
+            dict: The format and encoder options.
+        """
+        if self.format == 'JPEG':
+            return {'format': 'JPEG', 'quality': quality,
+                    'progressive': self.progressive,
+                    'optimize': self.optimize}
+        if self.format == 'WEBP':
+            return {'format': 'WEBP', 'quality': quality,
+                    'method': self.method}
+        return {'format': self.format, 'optimize': self.optimize}
+
+    def prepare(self, image):
+        """
+        Convert an image to a mode the format can store.
+
+        Args:
+            image (PIL.Image.Image): The image to encode.
+
+        Returns:
+            PIL.Image.Image: The image itself, or a converted copy.
+        """
+        if self.format == 'JPEG' and image.mode not in ('RGB', 'L', 'CMYK'):
+            return image.convert('RGB')
+        if self.format == 'WEBP' and image.mode not in ('RGB', 'RGBA'):
+            return image.convert('RGBA' if 'A' in image.getbands()
+                                 or 'transparency' in image.info
+                                 else 'RGB')
+        return image
+
+    def encode(self, image, f) -> int:
+        """
+        Encode an image into a binary file object.
+
+        Args:
+            image (PIL.Image.Image): The image to encode.
+            f (file): A binary file object to write the encoded image to.
+
+        Returns:
+            int: The quality used, which is below quality when it took a
+                lower one to fit target_bytes.
+        """
+        image = self.prepare(image)
+        if self.target_bytes is None or self.format not in LOSSY_FORMATS:
+            image.save(f, **self.save_options(self.quality))
+            return self.quality
+
+        buffer = BytesIO()
+        image.save(buffer, **self.save_options(self.quality))
+        if buffer.tell() <= self.target_bytes:
+            f.write(buffer.getbuffer())
+            return self.quality
+
+        best = None
+        best_quality = self.min_quality
+        low, high = self.min_quality, self.quality - 1
+        while low <= high:
+            quality = (low + high) // 2
+            buffer = BytesIO()
+            image.save(buffer, **self.save_options(quality))
+            if buffer.tell() <= self.target_bytes:
+                best, best_quality = buffer, quality
+                low = quality + 1
+            else:
+                high = quality - 1
+
+        if best is None:
+            image.save(f, **self.save_options(self.min_quality))
+        else:
+            f.write(best.getbuffer())
+        return best_quality
+
+    def for_animation(self):
+        """
+        Return the profile to encode an animation with.
+
+        Returns:
+            EncodingProfile: This profile if its format can hold several
+                frames, otherwise the GIF profile.
+        """
+        if self.format in ANIMATED_FORMATS:
+            return self
+        return PROFILES['gif']
+
+    def encode_frames(self, frames: list, durations: list, loop, f) -> None:
+        """
+        Encode the frames of an animation into a binary file object.
+
+        The target size is not searched for animations; quality is used
+        as is.
+
+        Args:
+            frames (list): The frames, as images of the same size and mode.
+            durations (list): The display time of each frame in ms.
+            loop (int or None): How many times the animation repeats,
+                0 meaning forever and None meaning it plays once.
+            f (file): A binary file object to write the animation to.
+
+        Raises:
+            ValueError: If the format cannot hold an animation.
+        """
+        if self.format not in ANIMATED_FORMATS:
+            raise ValueError(f"{self.format} cannot hold an animation")
+
+        options = self.save_options(self.quality)
+        if loop is not None:
+            options['loop'] = loop
+        elif self.format == 'WEBP':
+            options['loop'] = 1
+        frames[0].save(f, save_all=True, append_images=frames[1:],
+                       duration=durations, **options)
+
+    def __repr__(self):
+        """Return the profile options."""
+        return f"EncodingProfile({self.key()})"
+
+
+PROFILES = {
+    'jpeg': EncodingProfile('JPEG', quality=75, progressive=True,
+                            optimize=True),
+    'webp': EncodingProfile('WEBP', quality=75, method=4),
+    'png': EncodingProfile('PNG', optimize=True),
+    'gif': EncodingProfile('GIF', optimize=True),
+}
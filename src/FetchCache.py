@@ -0,0 +1,194 @@
+"""Module implementing an LRU cache of downloaded remote images."""
+from collections import OrderedDict
+from threading import Lock
+import re
+import time
+
+MAX_AGE_PATTERN = re.compile(r'(?:^|,)\s*max-age\s*=\s*"?(\d+)"?', re.I)
+
+
+class CachedImage:
+    """
+    A downloaded image body with the validators needed to revalidate it.
+
+    Attributes:
+        body (bytes): The body of the response.
+        etag (str or None): The ETag header of the response.
+        last_modified (str or None): The Last-Modified header.
+        expires_at (float): Monotonic time until which the body is fresh.
+    """
+
+    def __init__(self, body: bytes, etag: str = None,
+                 last_modified: str = None, expires_at: float = 0) -> None:
+        """
+        Create a CachedImage object instance.
+
+        Args:
+            body (bytes): The body of the response.
+            etag (str): The ETag header of the response. Default None.
+            last_modified (str): The Last-Modified header. Default None.
+            expires_at (float): Monotonic time until which the body is
+                fresh. Defaults to 0, meaning it must be revalidated.
+        """
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        """Return True if the body can be used without revalidation."""
+        return time.monotonic() < self.expires_at
+
+    def conditional_headers(self) -> dict:
+        """
+        Return the headers making a GET conditional on this body.
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers.
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def freshness_lifetime(headers) -> float:
+    """
+    Return for how many seconds a response may be used without revalidation.
+
+    Args:
+        headers (Mapping): The response headers.
+
+    Returns:
+        float: The max-age of the response, or 0 if it must be revalidated.
+    """
+    cache_control = headers.get('Cache-Control', '')
+    if 'no-cache' in cache_control.lower():
+        return 0
+    match = MAX_AGE_PATTERN.search(cache_control)
+    return float(match.group(1)) if match else 0
+
+
+def is_storable(headers) -> bool:
+    """
+    Return True if a response may be kept in the cache.
+
+    Args:
+        headers (Mapping): The response headers.
+
+    Returns:
+        bool: False if the response forbids storing or cannot be reused.
+    """
+    if 'no-store' in headers.get('Cache-Control', '').lower():
+        return False
+    return 'ETag' in headers or 'Last-Modified' in headers or \
+        freshness_lifetime(headers) > 0
+
+
+class FetchCache:
+    """
+    A byte-bounded LRU cache of downloaded images keyed by URL.
+
+    Attributes:
+        max_bytes (int): The budget for the cached bodies.
+        current_bytes (int): The bytes of bodies currently held.
+        hits (int): Lookups served without contacting the origin.
+        revalidations (int): Lookups confirmed by a 304 response.
+        misses (int): Lookups that needed a full download.
+        evictions (int): Number of entries evicted to respect the budget.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Create a FetchCache object instance.
+
+        Args:
+            max_bytes (int): The byte budget for cached bodies.
+                Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, url: str):
+        """
+        Look up a cached image and mark it as most recently used.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            CachedImage or None: The cached image, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, entry: CachedImage) -> None:
+        """
+        Insert an image, evicting least recently used entries if needed.
+
+        Bodies larger than the whole budget are not cached.
+
+        Args:
+            url (str): The URL of the image.
+            entry (CachedImage): The downloaded image.
+        """
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self.current_bytes -= len(old.body)
+
+            self._entries[url] = entry
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted.body)
+                self.evictions += 1
+
+    def record(self, outcome: str) -> None:
+        """
+        Count the outcome of a fetch.
+
+        Args:
+            outcome (str): One of 'hits', 'revalidations' or 'misses'.
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The hit, revalidation, miss and eviction counters with
+                the current number of entries and bytes held.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self):
+        """Return the number of cached images."""
+        return len(self._entries)
@@ -0,0 +1,61 @@
+"""Module implementing a process-wide pool of loaded font faces."""
+from threading import Lock
+from PIL import ImageFont
+
+
+class FontRegistry:
+    """
+    A thread-safe registry of TrueType fonts keyed on (font_path, size).
+
+    Each face is read and parsed from disk once per process and then
+    shared by every caller.
+    Attributes:
+        loads (int): Number of faces loaded from disk.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty FontRegistry object instance."""
+        self.loads = 0
+        self._fonts = {}
+        self._lock = Lock()
+
+    def get(self, font_path: str, size: int):
+        """
+        Return the font for the given path and size, loading it if needed.
+
+        Args:
+            font_path (str): The path to the font file.
+            size (int): The font size.
+
+        Returns:
+            PIL.ImageFont.FreeTypeFont: The loaded font.
+        """
+        key = (font_path, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            return font
+
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is None:
+                font = ImageFont.truetype(font_path, size=size)
+                self._fonts[key] = font
+                self.loads += 1
+            return font
+
+    def preload(self, faces) -> None:
+        """
+        Load a collection of faces ahead of the first request.
+
+        Args:
+            faces (iterable): (font_path, size) pairs to load.
+        """
+        for font_path, size in faces:
+            self.get(font_path, size)
+
+    def __len__(self):
+        """Return the number of loaded faces."""
+        return len(self._fonts)
+
+
+fonts = FontRegistry()
@@ -0,0 +1,123 @@
+"""Module implementing an in-process LRU cache of resized base images."""
+from collections import OrderedDict
+from threading import Lock
+from PIL import Image
+
+
+class ImageCache:
+    """
+    A byte-bounded LRU cache of decoded and resized base images.
+
+    Entries are keyed on the image identity (path, mtime and size, or a
+    digest of in-memory contents) and max_width, so that an edited file
+    or a different target width never returns a stale image.
+    Attributes:
+        max_bytes (int): The budget for the decoded pixel data held.
+        current_bytes (int): The decoded pixel data currently held.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups not found in the cache.
+        evictions (int): Number of entries evicted to respect the budget.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Create an ImageCache object instance.
+
+        Args:
+            max_bytes (int): The byte budget for cached images.
+                Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def image_size(image: Image) -> int:
+        """
+        Estimate the number of bytes held by a decoded image.
+
+        Args:
+            image (Image): The decoded image.
+
+        Returns:
+            int: The approximate size of the pixel data in bytes.
+        """
+        return image.width * image.height * len(image.getbands())
+
+    def get(self, key):
+        """
+        Look up an image and mark it as most recently used.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            PIL.Image.Image or None: The cached image, or None on a miss.
+        """
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key, image: Image) -> None:
+        """
+        Insert an image, evicting least recently used entries if needed.
+
+        Images larger than the whole budget are not cached.
+
+        Args:
+            key (tuple): The cache key.
+            image (Image): The decoded image to cache.
+        """
+        size = self.image_size(image)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= self.image_size(old)
+
+            self._entries[key] = image
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= self.image_size(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The hit, miss and eviction counters with the
+                current number of entries and bytes held.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self):
+        """Return the number of cached images."""
+        return len(self._entries)
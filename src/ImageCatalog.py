@@ -0,0 +1,254 @@
+"""Module implementing a persistent, recursive index of base images."""
+from threading import Lock
+from typing import NamedTuple
+import json
+import logging
+import os
+import random
+import tempfile
+from PIL import Image
+
+IMAGE_EXTENSIONS = ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp')
+INDEX_VERSION = 2
+
+
+class ImageEntry(NamedTuple):
+    """
+    One indexed base image.
+
+    Attributes:
+        path (str): The path of the image.
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+        mtime_ns (int): The modification time of the file.
+        size (int): The size of the file in bytes.
+    """
+
+    path: str
+    width: int
+    height: int
+    mtime_ns: int
+    size: int
+
+
+class ImageCatalog:
+    """
+    A recursive index of the images under a directory.
+
+    Every directory is recorded with its subdirectories and its image
+    files with their modification time, size and dimensions, and the
+    index is persisted as JSON. A refresh lists every directory with
+    `os.scandir` and stats its image files, so a file overwritten in
+    place is noticed even though its directory did not change, but it
+    only reads the header of new or changed files. Filtered selections
+    are cached, so `choice` is O(1).
+    Attributes:
+        root (str): The directory to index.
+        index_path (str or None): Where the index is persisted.
+        entries (tuple): The indexed images, as ImageEntry objects.
+    """
+
+    def __init__(self, root: str,
+                 index_path: str = './_data/.image_index.json') -> None:
+        """
+        Create an ImageCatalog object instance from its persisted index.
+
+        Call `refresh` to bring it up to date with the directory.
+
+        Args:
+            root (str): The directory to index.
+            index_path (str): Where the index is persisted. Defaults to
+                './_data/.image_index.json'. None disables persistence.
+        """
+        self.root = root
+        self.index_path = index_path
+        self.entries = ()
+        self._dirs = {}
+        self._selections = {}
+        self._lock = Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read the persisted index, ignoring a missing or invalid one."""
+        if self.index_path is None:
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logging.error(f"Ignoring invalid image index: {str(e)}")
+            return
+
+        if data.get('version') == INDEX_VERSION and \
+                data.get('root') == self.root:
+            self._dirs = data['dirs']
+            self._rebuild()
+
+    def _save(self) -> None:
+        """Persist the index atomically."""
+        if self.index_path is None:
+            return
+        directory = os.path.dirname(self.index_path) or '.'
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except OSError as e:
+            logging.error(f"Error writing image index: {e.strerror}")
+            return
+
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'root': self.root,
+                           'dirs': self._dirs}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logging.error(f"Error writing image index: {e.strerror}")
+            os.remove(tmp_path)
+
+    @staticmethod
+    def _dimensions(path: str):
+        """Return the (width, height) of an image, or None if unreadable."""
+        try:
+            with Image.open(path) as image:
+                return image.size
+        except Exception as e:
+            logging.error(f"Skipping unreadable image {path}: {str(e)}")
+            return None
+
+    def _scan_dir(self, path: str, dirs: dict) -> bool:
+        """
+        Index a directory and its subdirectories into dirs.
+
+        Args:
+            path (str): The directory to index.
+            dirs (dict): The new index, filled in place.
+
+        Returns:
+            bool: True if anything changed below path.
+        """
+        old = self._dirs.get(path)
+        old_files = {f[0]: f for f in old['files']} if old else {}
+        files = []
+        subdirs = []
+        try:
+            it = os.scandir(path)
+        except OSError:
+            return old is not None
+        with it:
+            for entry in sorted(it, key=lambda e: e.name):
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    if entry.name.split('.')[-1].lower() not in \
+                            IMAGE_EXTENSIONS or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                previous = old_files.get(entry.name)
+                if previous is not None and \
+                        previous[1] == stat.st_mtime_ns and \
+                        previous[2] == stat.st_size:
+                    files.append(previous)
+                    continue
+
+                dimensions = self._dimensions(entry.path)
+                if dimensions is not None:
+                    files.append([entry.name, stat.st_mtime_ns,
+                                  stat.st_size, *dimensions])
+
+        dirs[path] = {'subdirs': subdirs, 'files': files}
+        changed = old is None or old['files'] != files or \
+            old['subdirs'] != subdirs
+        for subdir in subdirs:
+            changed = self._scan_dir(subdir, dirs) or changed
+        return changed
+
+    def _rebuild(self) -> None:
+        """Rebuild the entries from the directory index."""
+        entries = []
+        for path, info in self._dirs.items():
+            for name, mtime_ns, size, width, height in info['files']:
+                entries.append(ImageEntry(os.path.join(path, name),
+                                          width, height, mtime_ns, size))
+        self.entries = tuple(entries)
+        self._selections = {}
+
+    def refresh(self) -> bool:
+        """
+        Bring the index up to date with the directory.
+
+        Returns:
+            bool: True if any image was added, removed or changed.
+        """
+        with self._lock:
+            dirs = {}
+            changed = self._scan_dir(self.root, dirs)
+            if changed or dirs.keys() != self._dirs.keys():
+                self._dirs = dirs
+                self._rebuild()
+                self._save()
+                return True
+            return False
+
+    def paths(self) -> list:
+        """Return the paths of all indexed images."""
+        return [entry.path for entry in self.entries]
+
+    def select(self, min_width: int = 0, min_aspect: float = None,
+               max_aspect: float = None) -> list:
+        """
+        Return the images matching the filters.
+
+        The result is cached until the index changes.
+
+        Args:
+            min_width (int): The smallest width accepted. Defaults to 0.
+            min_aspect (float): The smallest width / height accepted.
+                Defaults to None, meaning no lower bound.
+            max_aspect (float): The largest width / height accepted.
+                Defaults to None, meaning no upper bound.
+
+        Returns:
+            list: The matching ImageEntry objects.
+        """
+        key = (min_width, min_aspect, max_aspect)
+        selections = self._selections
+        selection = selections.get(key)
+        if selection is None:
+            selection = [
+                entry for entry in self.entries
+                if entry.width >= min_width
+                and (min_aspect is None
+                     or entry.width >= min_aspect * entry.height)
+                and (max_aspect is None
+                     or entry.width <= max_aspect * entry.height)]
+            selections[key] = selection
+        return selection
+
+    def choice(self, min_width: int = 0, min_aspect: float = None,
+               max_aspect: float = None, rng=random) -> str:
+        """
+        Pick a random image matching the filters in O(1).
+
+        Args:
+            min_width (int): The smallest width accepted. Defaults to 0.
+            min_aspect (float): The smallest width / height accepted.
+            max_aspect (float): The largest width / height accepted.
+            rng (random.Random): The random generator to draw from.
+                Defaults to the module-level generator.
+
+        Raises:
+            IndexError: If no image matches the filters.
+
+        Returns:
+            str: The path of the chosen image.
+        """
+        return rng.choice(self.select(min_width, min_aspect, max_aspect)).path
+
+    def __len__(self):
+        """Return the number of indexed images."""
+        return len(self.entries)
@@ -0,0 +1,205 @@
+"""Module implementing pooled, bounded downloads of remote base images."""
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import asyncio
+import socket
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from FetchCache import CachedImage, freshness_lifetime, is_storable
+
+
+class ImageFetchError(Exception):
+    """Raised when a remote image is too large or too slow to download."""
+
+
+class ImageFetcher:
+    """
+    Downloads remote images over a pool of persistent connections.
+
+    Every download has connect and read timeouts, an overall deadline and
+    a byte cap that is enforced while the body streams in. The body is
+    kept in memory, so it can be handed straight to the image decoder.
+    With a cache, repeated URLs are served from memory while fresh and
+    revalidated with a conditional GET once stale.
+    Attributes:
+        max_bytes (int): The largest body accepted, in bytes.
+        timeout (tuple): The (connect, read) timeouts in seconds.
+        deadline (float): The longest a whole download may take, in seconds.
+        cache (FetchCache or None): Cache of downloaded images.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, max_bytes: int = 10 * 1024 * 1024,
+                 connect_timeout: float = 3.05, read_timeout: float = 10,
+                 deadline: float = 30, pool_size: int = 10,
+                 max_workers: int = 8, cache=None) -> None:
+        """
+        Create an ImageFetcher object instance.
+
+        Args:
+            max_bytes (int): The largest body accepted. Defaults to 10 MiB.
+            connect_timeout (float): Seconds to establish a connection.
+                Defaults to 3.05.
+            read_timeout (float): Seconds to wait for each read.
+                Defaults to 10.
+            deadline (float): Seconds a whole download may take.
+                Defaults to 30.
+            pool_size (int): Connections kept open per host. Defaults to 10.
+            max_workers (int): Threads serving `fetch_async`. Defaults to 8.
+            cache (FetchCache): Optional cache of downloaded images.
+                Defaults to None, meaning every fetch downloads the image.
+        """
+        self.max_bytes = max_bytes
+        self.timeout = (connect_timeout, read_timeout)
+        self.deadline = deadline
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='image-fetch')
+
+    def fetch(self, url: str) -> BytesIO:
+        """
+        Download an image into memory.
+
+        Args:
+            url (str): The URL of the image.
+
+        Raises:
+            ImageFetchError: If the body exceeds max_bytes or the download
+                exceeds the deadline.
+            requests.exceptions.RequestException: If the request fails or
+                the server answers with an error status.
+
+        Returns:
+            BytesIO: The body of the response, positioned at its start.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and entry.is_fresh():
+            self.cache.record('hits')
+            return BytesIO(entry.body)
+
+        headers = entry.conditional_headers() if entry is not None else {}
+        start = time.monotonic()
+        with self.session.get(url, stream=True, timeout=self.timeout,
+                              headers=headers) as response:
+            if entry is not None and response.status_code == 304:
+                entry.expires_at = time.monotonic() + \
+                    freshness_lifetime(response.headers)
+                self.cache.record('revalidations')
+                return BytesIO(entry.body)
+
+            response.raise_for_status()
+            expired = threading.Event()
+            watchdog = threading.Timer(
+                max(0, self.deadline - (time.monotonic() - start)),
+                self._expire, (response, expired))
+            watchdog.start()
+            try:
+                buffer = self._read_body(response, start, expired)
+            finally:
+                watchdog.cancel()
+
+        if self.cache is not None:
+            self.cache.record('misses')
+            if is_storable(response.headers):
+                self.cache.put(url, CachedImage(
+                    buffer.getvalue(), response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    time.monotonic() + freshness_lifetime(response.headers)))
+        return buffer
+
+    @staticmethod
+    def _expire(response, expired: threading.Event) -> None:
+        """
+        Abort a download that ran past the deadline.
+
+        Closing the response would wait for the blocked read, so the
+        socket is shut down instead, which makes the read return.
+
+        Args:
+            response (requests.Response): The streaming response.
+            expired (threading.Event): Set to tell the reader why.
+        """
+        expired.set()
+        sock = getattr(response.raw.connection, 'sock', None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _read_body(self, response, start: float,
+                   expired: threading.Event) -> BytesIO:
+        """
+        Stream a response body into memory, enforcing the limits.
+
+        A read can block until a whole chunk arrives, so the deadline is
+        also enforced by a watchdog shutting down the connection; expired
+        tells that it fired.
+
+        Args:
+            response (requests.Response): A streaming response.
+            start (float): The monotonic time the download started.
+            expired (threading.Event): Set when the watchdog fired.
+
+        Raises:
+            ImageFetchError: If a limit is exceeded.
+
+        Returns:
+            BytesIO: The body of the response, positioned at its start.
+        """
+        length = response.headers.get('Content-Length')
+        if length is not None and length.isdigit() and \
+                int(length) > self.max_bytes:
+            raise ImageFetchError(
+                f"Image is {length} bytes, limit is {self.max_bytes}")
+
+        buffer = BytesIO()
+        try:
+            for chunk in response.iter_content(self.chunk_size):
+                buffer.write(chunk)
+                if buffer.tell() > self.max_bytes:
+                    raise ImageFetchError(
+                        f"Image exceeds the limit of {self.max_bytes} bytes")
+                if time.monotonic() - start > self.deadline:
+                    break
+        except ImageFetchError:
+            raise
+        except Exception:
+            if not expired.is_set():
+                raise
+        if expired.is_set() or time.monotonic() - start > self.deadline:
+            raise ImageFetchError(
+                f"Image download exceeded {self.deadline} seconds")
+
+        buffer.seek(0)
+        return buffer
+
+    async def fetch_async(self, url: str) -> BytesIO:
+        """
+        Download an image without blocking the event loop.
+
+        The download runs on the fetcher's own thread pool, so an async
+        route waiting on a slow origin does not hold up other requests.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            BytesIO: The body of the response, positioned at its start.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.fetch, url)
+
+    def close(self) -> None:
+        """Close the pooled connections and the worker threads."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
@@ -1,10 +1,117 @@
 """Module to manipulate base image of the meme and overlay text message."""
-from PIL import Image, ImageDraw, ImageFont
-from datetime import datetime
+from PIL import Image, ImageDraw, ImageSequence
+from typing import NamedTuple
 import os
-import textwrap
+import hashlib
+import tempfile
+from contextlib import nullcontext
+from io import BytesIO
 import random
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ImageCache import ImageCache
+from FontRegistry import fonts
+from TextLayout import layouts
+from OutputRetention import OutputRetention
+from EncodingProfile import PROFILES
+
+DEFAULT_FONT_PATH = "./_data/fonts/LilitaOne-Regular.ttf"
+DEFAULT_FONT_SIZE = 20
+DEFAULT_MIN_FONT_SIZE = 10
+DEFAULT_MAX_WIDTH = 500
+LAYOUT_QUANTUM = 8
+MAX_FRAMES = 300
+DEFAULT_FRAME_DURATION = 100
+ANIMATED_EXTENSIONS = ('gif', 'webp', 'png', 'apng')
+
+NULL_STAGE = nullcontext()
+
+
+class Animation(NamedTuple):
+    """
+    The frames of a rendered animated meme.
+
+    Attributes:
+        frames (list): The resized frames with the caption, as images.
+        durations (list): The display time of each frame in ms.
+        loop (int or None): How many times the animation repeats,
+            0 meaning forever and None meaning it plays once.
+    """
+
+    frames: list
+    durations: list
+    loop: int = None
+
+
+def layer_padding(layout) -> int:
+    """
+    Return the margin around a rendered caption for glyph overhangs.
+
+    Args:
+        layout (Layout): The wrapped caption.
+
+    Returns:
+        int: The margin in pixels on every side of the text layer.
+    """
+    return layout.font_size // 4 + 1
+
+
+def drawable_mode(image) -> str:
+    """
+    Return the mode to convert an image to before text is pasted on it.
+
+    Palette and other modes cannot take a color fill, so they are drawn
+    on in RGB, or RGBA when they carry transparency.
+
+    Args:
+        image (PIL.Image.Image): The base image or animation frame.
+
+    Returns:
+        str: The mode of the image if it can be drawn on as is,
+            otherwise 'RGB' or 'RGBA'.
+    """
+    if image.mode in ('RGB', 'RGBA', 'L'):
+        return image.mode
+    if 'A' in image.getbands() or 'transparency' in image.info:
+        return 'RGBA'
+    return 'RGB'
+
+
+_worker_engine = None
+
+
+def _init_worker(output_dir: str, config: dict) -> None:
+    """
+    Create the MemeEngine used by one batch worker process.
+
+    The engine, its image cache and the default font live for the whole
+    life of the worker so they are loaded once, not once per job.
+
+    Args:
+        output_dir (str): The directory to save meme images.
+        config (dict): Keyword arguments of `MemeEngine`, as returned by
+            `MemeEngine.worker_config` of the parent engine.
+    """
+    global _worker_engine
+    _worker_engine = MemeEngine(output_dir, **config)
+    _worker_engine.fonts.preload([(DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE)])
+
+
+def _run_job(job: dict):
+    """
+    Render one batch job inside a worker process.
+
+    Args:
+        job (dict): Keyword arguments for `MemeEngine.make_meme`.
+
+    Returns:
+        str or None: The path to the saved meme, or None on failure.
+    """
+    try:
+        return _worker_engine.make_meme(**job)
+    except Exception as e:
+        logging.error(f"Failed to create meme: {str(e)}")
+        return None
 
 
 class MemeEngine:
@@ -15,16 +122,137 @@ class MemeEngine:
     It saves the resulting image to a specified directory.
     Attributes:
         output_dir (str): The directory to save meme images.
+        image_cache (ImageCache or None): Cache of resized base images.
+        text_layers (ImageCache or None): Cache of rendered caption masks.
+        fonts (FontRegistry): Shared pool of loaded font faces.
+        layouts (TextLayoutEngine): Shared cache of wrapped captions.
+        result_cache (RenderCache or None): Cache of rendered meme files.
+        retention (OutputRetention or None): Garbage collector of the
+            output directory.
+        resample (int): The Pillow resampling filter used to resize.
+        draft (bool): Whether JPEGs are decoded at a reduced scale.
+        metrics (Metrics or None): Recorder of per-stage timings.
+        profile (EncodingProfile): How memes are encoded by default.
+        max_frames (int): Cap on the frames kept from an animation.
     """
 
-    def __init__(self, output_dir: str) -> None:
+    def __init__(self, output_dir: str,
+                 cache_bytes: int = 64 * 1024 * 1024,
+                 result_cache=None, resample: int = Image.BICUBIC,
+                 draft: bool = True, metrics=None,
+                 text_layer_bytes: int = 8 * 1024 * 1024,
+                 profile=None, max_frames: int = MAX_FRAMES) -> None:
         """
         Create a MemeEngine object instance.
 
         Args:
             output_dir (str): The directory to save meme images.
+            cache_bytes (int): Byte budget of the resized base image cache.
+                Defaults to 64 MiB. Use 0 to disable the cache.
+            result_cache (RenderCache): Optional cache of rendered memes.
+                Defaults to None, meaning rendered memes are not tracked.
+            resample (int): The Pillow resampling filter used to resize,
+                trading quality for speed. Defaults to Image.BICUBIC.
+            draft (bool): Decode JPEGs with DCT scaling close to the
+                target size before resampling. Defaults to True.
+            metrics (Metrics): Optional recorder of per-stage timings.
+                Defaults to None, meaning nothing is recorded.
+            text_layer_bytes (int): Byte budget of the rendered caption
+                cache. Defaults to 8 MiB. Use 0 to disable the cache.
+            profile (EncodingProfile): How memes are encoded unless a call
+                asks for another profile. Defaults to PROFILES['jpeg'].
+            max_frames (int): Cap on the frames kept from an animated
+                base image, which bounds the memory of one meme.
+                Defaults to 300.
         """
         self.output_dir = output_dir
+        self.image_cache = ImageCache(cache_bytes) if cache_bytes else None
+        self.text_layers = ImageCache(text_layer_bytes) \
+            if text_layer_bytes else None
+        self.fonts = fonts
+        self.layouts = layouts
+        self.result_cache = result_cache
+        self.retention = None
+        self.resample = resample
+        self.draft = draft
+        self.metrics = metrics
+        self.profile = profile or PROFILES['jpeg']
+        self.max_frames = max_frames
+
+    def _stage(self, name: str):
+        """
+        Return a context manager timing a stage if metrics are enabled.
+
+        Args:
+            name (str): The name of the stage.
+
+        Returns:
+            A context manager recording the stage, or a no-op one.
+        """
+        if self.metrics is None:
+            return NULL_STAGE
+        return self.metrics.stage(name)
+
+    def enable_retention(self, max_files: int = None, max_bytes: int = None,
+                         max_age: float = None, background: bool = True,
+                         **kwargs) -> OutputRetention:
+        """
+        Bound the output directory by file count, total bytes or age.
+
+        Args:
+            max_files (int): Cap on the number of files. Default None.
+            max_bytes (int): Cap on the total bytes of files. Default None.
+            max_age (float): Cap on the age of a file in seconds.
+                Defaults to None.
+            background (bool): Collect in a background thread.
+                Defaults to True. Otherwise call `retention.run_once()`.
+            **kwargs: Further options of `OutputRetention`.
+
+        Returns:
+            OutputRetention: The retention collector of this engine.
+        """
+        if self.retention is not None:
+            self.retention.stop()
+
+        self.retention = OutputRetention(
+            self.output_dir, max_files=max_files, max_bytes=max_bytes,
+            max_age=max_age, on_evict=self._forget_output, **kwargs)
+        if background:
+            self.retention.start()
+        return self.retention
+
+    def _forget_output(self, path: str) -> None:
+        """
+        Drop a removed output file from the rendered meme cache.
+
+        Args:
+            path (str): The path of the removed meme.
+        """
+        if self.result_cache is not None:
+            self.result_cache.discard(path)
+
+    @staticmethod
+    def _touch_output(path: str) -> bool:
+        """
+        Mark an existing meme as just served.
+
+        Refreshing the modification time keeps a meme that is served
+        again from being the first one evicted by the retention.
+
+        Args:
+            path (str): The path of the meme.
+
+        Returns:
+            bool: True if the file exists, False otherwise.
+        """
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logging.error(f"Error touching meme: {e.strerror}")
+            return os.path.exists(path)
 
     def resize_image(self, original_image: Image, max_width: int) -> Image:
         """
@@ -40,13 +268,14 @@ class MemeEngine:
         if original_image.width > max_width:
             ratio = max_width / original_image.width
             new_height = round(original_image.height * ratio)
-            resized_image = original_image.resize((max_width, new_height))
+            resized_image = original_image.resize(
+                (max_width, new_height), resample=self.resample)
         else:
             resized_image = original_image
 
         return resized_image
 
-    def get_random_location(self, width, height, lb, ub):
+    def get_random_location(self, width, height, lb, ub, rng=random):
         """
         Generate a random location within the specified bounds.
 
@@ -57,43 +286,29 @@ class MemeEngine:
                 image width or height.
             ub (float): Upper bound of the text location as a % of the
                 image width or height.
+            rng (random.Random): The random generator to draw from.
+                Defaults to the module-level generator.
 
         Returns:
             tuple: A tuple containing the coordinates (x, y).
         """
-        x = random.uniform(width * lb, width * ub)
-        y = random.uniform(height * lb, height * ub)
+        x = rng.uniform(width * lb, width * ub)
+        y = rng.uniform(height * lb, height * ub)
         return x, y
 
-    def wrap_text(self, message, message_width, valid_width):
-        """
-        Wrap a message into multiple lines to fit within the valid_width.
-
-        Args:
-            message (str): The text message to be wrapped.
-            message_width (int): Width of the original message in pixels.
-            valid_width (int): Width of the available space in pixels.
-
-        Returns:
-            list: A list of wrapped lines, where each line fits within
-                  the valid_width constraint.
-
-        """
-        avg_char_width = message_width / len(message)
-        wrapped_width = int(valid_width / avg_char_width)
-        wrapper = textwrap.TextWrapper(width=wrapped_width)
-        wrapped_lines = wrapper.wrap(text=message)
-        return wrapped_lines
-
     def overlay_text(
             self, resized_image: Image, text: str, author: str, font_path: str,
-            font_size: int = 20, font_color: str = "white",
-            lb: float = 0.01, ub: float = 0.5) -> None:
+            font_size: int = DEFAULT_FONT_SIZE, font_color: str = "white",
+            lb: float = 0.01, ub: float = 0.5, rng=random,
+            min_font_size: int = DEFAULT_MIN_FONT_SIZE) -> None:
         """
         Overlay text on an image.
 
         Write text at a random location in the image.
-        Wrap text that is wider than image width.
+        Wrap text by its measured width so every line fits between the
+        location and the right edge, and shrink it if needed so that it
+        fits above the bottom edge. The caption is rendered once into a
+        cached mask and composited onto the image with one paste.
 
         Args:
             resized_image (Image): The image to overlay text on.
@@ -106,38 +321,119 @@ class MemeEngine:
                 of image width or height.
             ub (float): Upper bound of the text location as a %
                 of image width or height.
+            rng (random.Random): The random generator used to place
+                the text. Defaults to the module-level generator.
+            min_font_size (int): The smallest size the text is shrunk to
+                when it is too tall for the image. Defaults to 10.
+        """
+        mask, position = self.place_text(
+            resized_image.width, resized_image.height, text, author,
+            font_path, font_size=font_size, lb=lb, ub=ub, rng=rng,
+            min_font_size=min_font_size)
+        resized_image.paste(font_color, position, mask)
+
+    def place_text(
+            self, width: int, height: int, text: str, author: str,
+            font_path: str, font_size: int = DEFAULT_FONT_SIZE,
+            lb: float = 0.01, ub: float = 0.5, rng=random,
+            min_font_size: int = DEFAULT_MIN_FONT_SIZE) -> tuple:
+        """
+        Choose where a caption goes on an image and render its mask.
+
+        The arguments are those of `overlay_text`, with the size of the
+        image in place of the image, so one placement can be pasted onto
+        every frame of an animation.
+
+        Returns:
+            tuple: The text layer mask and the (x, y) position to paste
+                it at.
         """
-        draw = ImageDraw.Draw(resized_image)
         message = text + ' - ' + author
-        font = ImageFont.truetype(font_path, size=font_size)
 
         x, y = self.get_random_location(
-            width=resized_image.width, height=resized_image.height,
-            lb=lb, ub=ub)
-        message_width, message_height = font.getsize(message)
-        if message_width > (resized_image.width - x - 3):
-            wrapped_lines = self.wrap_text(
-                message, message_width, (resized_image.width - x - 3))
-
-            for i, line in enumerate(wrapped_lines):
-                draw.text((x, y + message_height * i), line,
-                          font=font, fill=font_color)
-        else:
-            draw.text((x, y), message, font=font, fill=font_color)
+            width=width, height=height, lb=lb, ub=ub, rng=rng)
+        # Boxes are rounded down to a multiple of LAYOUT_QUANTUM pixels so
+        # that nearby locations share a cached layout.
+        box_width = int(width - x - 3) // LAYOUT_QUANTUM * LAYOUT_QUANTUM
+        box_height = int(height - y - 3) // LAYOUT_QUANTUM * LAYOUT_QUANTUM
+        layout = self.layouts.layout(
+            message, font_path, font_size, box_width,
+            max_height=box_height, min_size=min_font_size)
+
+        mask = self.text_layer(layout, font_path)
+        padding = layer_padding(layout)
+        return mask, (round(x) - padding, round(y) - padding)
+
+    def text_layer(self, layout, font_path: str) -> Image:
+        """
+        Return the caption of a layout rendered as an alpha mask.
+
+        The glyphs are rasterized once per layout and font, and the mask
+        can then be composited onto any number of base images in any
+        color with a single `Image.paste`.
 
-    def read_image(self, img_path):
+        Args:
+            layout (Layout): The wrapped caption.
+            font_path (str): The path to the font file to use.
+
+        Returns:
+            PIL.Image.Image: An 'L' mode image, 255 where the text is
+                opaque, with `layer_padding(layout)` pixels of margin
+                around the first line's origin.
+        """
+        key = (font_path, layout)
+        if self.text_layers is not None:
+            mask = self.text_layers.get(key)
+            if mask is not None:
+                return mask
+
+        font = self.fonts.get(font_path, layout.font_size)
+        padding = layer_padding(layout)
+        boxes = [font.getbbox(line) for line in layout.lines] or \
+            [(0, 0, 0, 0)]
+        width = max(box[2] for box in boxes) + 2 * padding
+        height = layout.line_height * (len(boxes) - 1) + \
+            max(box[3] for box in boxes) + 2 * padding
+
+        mask = Image.new('L', (width, height), 0)
+        draw = ImageDraw.Draw(mask)
+        for i, line in enumerate(layout.lines):
+            draw.text((padding, padding + layout.line_height * i), line,
+                      font=font, fill=255)
+
+        if self.text_layers is not None:
+            self.text_layers.put(key, mask)
+        return mask
+
+    def read_image(self, img_path, max_width: int = None):
         """
         Read an image from the specified path.
 
+        When max_width is given and drafting is enabled, a JPEG is set up
+        to be decoded at the smallest DCT scale (1/2, 1/4 or 1/8) that is
+        still at least max_width wide, so the full resolution image is
+        never decoded.
+
         Args:
-            img_path (str): The path to the image file.
+            img_path (str or file): The path to the image file, or a
+                binary file object holding the image.
+            max_width (int): The width the image will be resized to.
+                Defaults to None, meaning the image is decoded in full.
 
         Returns:
             PIL.Image.Image or None: The loaded image,
             or None if the file is not found or cannot be opened.
         """
         try:
+            if hasattr(img_path, 'seek'):
+                img_path.seek(0)
             original_image = Image.open(img_path)
+            if self.draft and max_width is not None and \
+                    original_image.format == 'JPEG' and \
+                    original_image.width > max_width:
+                ratio = max_width / original_image.width
+                original_image.draft(None, (
+                    max_width, round(original_image.height * ratio)))
             return original_image
         except FileNotFoundError:
             logging.error("File not found")
@@ -146,15 +442,198 @@ class MemeEngine:
             logging.error(f"Error opening image: {str(e)}")
             return None
 
-    def save_image(self, datestr_frmt, resized_image):
+    def load_base_image(self, img_path: str, max_width: int):
+        """
+        Return a resized copy of the image, using the cache when possible.
+
+        The cache holds the decoded and resized image keyed on the image
+        identity and max_width; callers get a copy they may draw on.
+
+        Args:
+            img_path (str or file): The path to the image file, or a
+                binary file object holding the image.
+            max_width (int): The max width of the resized image.
+
+        Returns:
+            PIL.Image.Image or None: A resized image safe to modify,
+            or None if the image cannot be read.
+        """
+        key = None
+        if self.image_cache is not None:
+            key = (self.image_identity(img_path), max_width)
+            cached = self.image_cache.get(key)
+            if cached is not None:
+                return cached.copy()
+
+        with self._stage('decode'):
+            original_image = self.read_image(img_path, max_width)
+            if original_image is None:
+                return None
+            original_image.load()
+            mode = drawable_mode(original_image)
+            if original_image.mode != mode:
+                original_image = original_image.convert(mode)
+
+        with self._stage('resize'):
+            resized_image = self.resize_image(original_image, max_width)
+        if key is None:
+            return resized_image
+
+        resized_image.load()
+        self.image_cache.put(key, resized_image)
+        return resized_image.copy()
+
+    def image_identity(self, img_path) -> str:
+        """
+        Return a string identifying the current contents of an image.
+
+        Args:
+            img_path (str or file): The path to the image file, or a
+                binary in-memory file object holding the image.
+
+        Returns:
+            str: The absolute path, modification time and size of a file,
+                or a digest of the contents of an in-memory file.
+        """
+        if hasattr(img_path, 'getbuffer'):
+            digest = hashlib.blake2b(img_path.getbuffer(), digest_size=16)
+            return 'bytes:' + digest.hexdigest()
+
+        try:
+            stat = os.stat(img_path)
+        except OSError:
+            return os.path.abspath(img_path)
+        return f"{os.path.abspath(img_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def is_animated(self, img_path) -> bool:
+        """
+        Return True if an image has more than one frame.
+
+        Paths whose extension cannot hold an animation are not opened.
+
+        Args:
+            img_path (str or file): The path to the image file, or a
+                binary file object holding the image.
+
+        Returns:
+            bool: True for animated GIF, WebP and PNG images.
+        """
+        if isinstance(img_path, str) and \
+                img_path.split('.')[-1].lower() not in ANIMATED_EXTENSIONS:
+            return False
+        try:
+            if hasattr(img_path, 'seek'):
+                img_path.seek(0)
+            with Image.open(img_path) as image:
+                return getattr(image, 'is_animated', False)
+        except Exception:
+            return False
+
+    def output_profile(self, img_path, profile=None):
+        """
+        Return the encoding a meme of an image is written with.
+
+        Args:
+            img_path (str or file): The path to the image file, or a
+                binary file object holding the image.
+            profile (EncodingProfile): The requested encoding.
+                Defaults to None, meaning the engine's profile.
+
+        Returns:
+            EncodingProfile: The requested profile, or for an animated
+                image its animated counterpart.
+        """
+        profile = profile or self.profile
+        if self.is_animated(img_path):
+            return profile.for_animation()
+        return profile
+
+    def meme_key(
+            self, img_path: str, text: str, author: str, max_width: int,
+            font_path: str, font_size: int, seed, profile=None) -> str:
+        """
+        Return a content address for a meme from everything that renders it.
+
+        Identical inputs always map to the same key and distinct inputs
+        map to distinct keys.
+
+        Args:
+            img_path (str or file): Path to the image, or a binary
+                file object holding it.
+            text (str): The text to add to the image.
+            author (str): The author of the meme.
+            max_width (int): The max width of the resized image.
+            font_path (str): The path to the font file to use.
+            font_size (int): The font size to use.
+            seed: The seed placing the text on the image.
+            profile (EncodingProfile): The encoding of the meme.
+                Defaults to None, meaning the engine's profile.
+
+        Returns:
+            str: A hexadecimal digest usable as a file name.
+        """
+        profile = profile or self.profile
+        parts = [self.image_identity(img_path), text, author,
+                 str(max_width), self.resample, self.draft,
+                 os.path.abspath(font_path), str(font_size), str(seed),
+                 profile.key(), self.max_frames]
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            encoded = str(part).encode('utf-8')
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def output_path(self, key: str, profile=None) -> str:
+        """
+        Return the path of the output file for a meme key.
+
+        Args:
+            key (str): The content address of the meme.
+            profile (EncodingProfile): The encoding of the meme, which
+                gives the file extension. Defaults to the engine's profile.
+
+        Returns:
+            str: The path to the meme image in the output directory.
+        """
+        profile = profile or self.profile
+        return os.path.join(self.output_dir, f"{key}.{profile.extension}")
+
+    def encode_image(self, resized_image, f, profile=None) -> None:
+        """
+        Encode an image or an animation into a binary file object.
+
+        Args:
+            resized_image (PIL.Image.Image or Animation): The image to
+                encode.
+            f (file): A binary file object to write the encoded image to.
+            profile (EncodingProfile): The encoding to use.
+                Defaults to None, meaning the engine's profile.
+        """
+        profile = profile or self.profile
+        with self._stage('encode'):
+            if isinstance(resized_image, Animation):
+                profile.for_animation().encode_frames(
+                    resized_image.frames, resized_image.durations,
+                    resized_image.loop, f)
+            else:
+                profile.encode(resized_image, f)
+        if self.metrics is not None:
+            self.metrics.observe_bytes('encode', f.tell())
+
+    def save_image(self, resized_image, key, profile=None):
         """
         Save the resized image to the specified output directory.
 
+        The image is written to a temporary file first and then renamed,
+        so a concurrent reader never sees a partially written file.
+
         Args:
-            datestr_frmt (str): The format string for the date to be
-                used in the output filename.
-            resized_image (PIL.Image.Image): The resized image
-                as a PIL.Image.Image object.
+            resized_image (PIL.Image.Image or Animation): The resized
+                image, or the frames of an animated meme.
+            key (str): The content address used as the output filename.
+            profile (EncodingProfile): The encoding to use.
+                Defaults to None, meaning the engine's profile.
 
         Returns:
             str or None: The filepath of the saved image if successful,
@@ -162,49 +641,254 @@ class MemeEngine:
         """
         if not os.path.exists(self.output_dir):
             try:
-                os.makedirs(self.output_dir)
+                os.makedirs(self.output_dir, exist_ok=True)
             except OSError as e:
                 logging.error(
                     f"Error creating directory: {self.output_dir}:\
                         {e.strerror}")
                 return None
 
-        output_filepath = os.path.join(
-            self.output_dir, datetime.now().strftime(datestr_frmt) + '.jpg')
+        buffer = BytesIO()
+        self.encode_image(resized_image, buffer, profile)
+
+        output_filepath = self.output_path(key, profile)
         try:
-            resized_image.save(output_filepath)
+            with self._stage('write'):
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self.output_dir, prefix='.' + key, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(buffer.getbuffer())
+                    os.chmod(tmp_path, 0o644)
+                    os.replace(tmp_path, output_filepath)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+            if self.metrics is not None:
+                self.metrics.observe_bytes('write', buffer.tell())
             return output_filepath
         except IOError as e:
             logging.error(f"Error saving image: {e.strerror}")
             return None
 
+    def render(self, img_path: str, text: str, author: str, max_width: int,
+               font_path: str, font_size: int, key: str):
+        """
+        Render a meme into a new image without saving it.
+
+        Args:
+            img_path (str or file): Path to the image, or a binary
+                file object holding it.
+            text (str): The text to add to the image.
+            author (str): The author of the meme.
+            max_width (int): The max width of the resized image.
+            font_path (str): The path to the font file to use.
+            font_size (int): The font size to use.
+            key (str): The meme key, which seeds the text location.
+
+        Returns:
+            PIL.Image.Image or Animation: The rendered meme, or its
+                frames if the image is animated.
+        """
+        if self.is_animated(img_path):
+            return self.render_frames(img_path, text, author, max_width,
+                                      font_path, font_size, key)
+
+        resized_image = self.load_base_image(img_path, max_width)
+        with self._stage('draw'):
+            self.overlay_text(resized_image, text, author, font_path,
+                              font_size=font_size, rng=random.Random(key))
+        return resized_image
+
+    def render_frames(self, img_path, text: str, author: str,
+                      max_width: int, font_path: str, font_size: int,
+                      key: str, font_color: str = "white"):
+        """
+        Render every frame of an animated meme.
+
+        Frames are decoded one at a time, so only one source frame is
+        held at full size. Each is resized and gets the same text layer
+        pasted at the same place, and at most max_frames are kept.
+
+        Args:
+            img_path (str or file): Path to the animated image, or a
+                binary file object holding it.
+            text (str): The text to add to the image.
+            author (str): The author of the meme.
+            max_width (int): The max width of the resized frames.
+            font_path (str): The path to the font file to use.
+            font_size (int): The font size to use.
+            key (str): The meme key, which seeds the text location.
+            font_color (str): The color to use for the text. Default "white".
+
+        Returns:
+            Animation or None: The frames with their durations and loop
+                count, or None if the image cannot be read.
+        """
+        with self._stage('decode'):
+            original_image = self.read_image(img_path)
+        if original_image is None:
+            return None
+
+        loop = original_image.info.get('loop')
+        mode = drawable_mode(original_image)
+        frames = []
+        durations = []
+        mask = position = None
+        for index, frame in enumerate(ImageSequence.Iterator(original_image)):
+            if index >= self.max_frames:
+                logging.warning(
+                    f"Keeping the first {self.max_frames} frames of "
+                    f"{original_image.n_frames}")
+                break
+
+            with self._stage('frame'):
+                # Some readers, WebP among them, only set the duration of
+                # a frame when it is loaded, so convert before reading it.
+                converted = frame.convert(mode)
+                durations.append(
+                    frame.info.get('duration') or DEFAULT_FRAME_DURATION)
+                resized_frame = self.resize_image(converted, max_width)
+                if mask is None:
+                    mask, position = self.place_text(
+                        resized_frame.width, resized_frame.height, text,
+                        author, font_path, font_size=font_size,
+                        rng=random.Random(key))
+                resized_frame.paste(font_color, position, mask)
+            frames.append(resized_frame)
+
+        original_image.close()
+        return Animation(frames, durations, loop)
+
+    def render_to_bytes(
+            self, img_path: str, text: str, author: str,
+            max_width: int = DEFAULT_MAX_WIDTH,
+            font_path: str = DEFAULT_FONT_PATH,
+            font_size: int = DEFAULT_FONT_SIZE,
+            seed=None, profile=None) -> tuple:
+        """
+        Create a meme and encode it into memory instead of a file.
+
+        The arguments are the same as for `make_meme`, and the same inputs
+        produce the same image.
+        Args:
+            img_path (str or file): Path to the image, or a binary
+                file object holding it.
+            text (str): The text to add to the image.
+            author (str): The author of the meme.
+            max_width (int): The max width of the resized image. Default 500.
+            font_path (str): The path to the font file to use.
+            font_size (int): The font size to use. Defaults to 20.
+            seed: Seed for the text location. Defaults to None, which
+                derives the location from the other inputs.
+            profile (EncodingProfile): The encoding of the meme.
+                Defaults to None, meaning the engine's profile.
+
+        Returns:
+            tuple: The encoded bytes and the meme key, which is
+                suitable as an ETag.
+        """
+        profile = self.output_profile(img_path, profile)
+        key = self.meme_key(img_path, text, author, max_width, font_path,
+                            font_size, seed, profile)
+        resized_image = self.render(
+            img_path, text, author, max_width, font_path, font_size, key)
+
+        buffer = BytesIO()
+        self.encode_image(resized_image, buffer, profile)
+        return buffer.getvalue(), key
+
     def make_meme(
             self, img_path: str, text: str, author: str,
-            max_width: int = 500,
-            font_path: str = "./_data/fonts/LilitaOne-Regular.ttf",
-            datestr_frmt: str = "%m%d%Y_%H%M%S") -> str:
+            max_width: int = DEFAULT_MAX_WIDTH,
+            font_path: str = DEFAULT_FONT_PATH,
+            font_size: int = DEFAULT_FONT_SIZE,
+            seed=None, profile=None) -> str:
         """
         Create a meme.
 
         Resize the image at the specified path and add text to it.
-        Save the resulting image to the specified directory.
+        Save the resulting image to the specified directory under a name
+        derived from the inputs; if that file already exists the
+        rendering is skipped and the file is marked as recently served.
         Args:
-            img_path (str): Path to the image.
+            img_path (str or file): Path to the image, or a binary
+                file object holding it.
             text (str): The text to add to the image.
             author (str): The author of the meme.
             max_width (int): The max width of the resized image. Default 500.
             font_path (str): The path to the font file to use.
-            datestr_frmt (str): The timestamp format to use in output file.
-                Defaults to "%m%d%Y_%H%M%S".
+            font_size (int): The font size to use. Defaults to 20.
+            seed: Seed for the text location. Defaults to None, which
+                derives the location from the other inputs.
+            profile (EncodingProfile): The encoding of the meme.
+                Defaults to None, meaning the engine's profile.
 
         Returns:
             str: The path to the saved meme image.
         """
-        original_image = self.read_image(img_path)
+        profile = self.output_profile(img_path, profile)
+        key = self.meme_key(img_path, text, author, max_width, font_path,
+                            font_size, seed, profile)
+        if self.result_cache is not None:
+            output_filepath = self.result_cache.get(key)
+            if output_filepath is not None and \
+                    self._touch_output(output_filepath):
+                return output_filepath
+
+        output_filepath = self.output_path(key, profile)
+        rendered = not self._touch_output(output_filepath)
+        if rendered:
+            resized_image = self.render(
+                img_path, text, author, max_width, font_path, font_size, key)
+            output_filepath = self.save_image(resized_image, key, profile)
+
+        if self.result_cache is not None and output_filepath is not None:
+            self.result_cache.put(key, output_filepath, owned=rendered)
+        return output_filepath
 
-        resized_image = self.resize_image(original_image, max_width)
-        self.overlay_text(resized_image, text, author, font_path)
+    def worker_config(self) -> dict:
+        """
+        Return the settings a batch worker needs to render like this engine.
 
-        output_filepath = self.save_image(datestr_frmt, resized_image)
+        The caches are recreated empty in each worker with the same
+        budgets. The result cache, retention and metrics stay with this
+        engine.
 
-        return output_filepath
+        Returns:
+            dict: Keyword arguments of `MemeEngine` besides output_dir.
+        """
+        return {
+            'cache_bytes':
+                self.image_cache.max_bytes if self.image_cache else 0,
+            'resample': self.resample,
+            'draft': self.draft,
+            'text_layer_bytes':
+                self.text_layers.max_bytes if self.text_layers else 0,
+            'profile': self.profile,
+            'max_frames': self.max_frames,
+        }
+
+    def make_memes(self, jobs, workers: int = None):
+        """
+        Create many memes in parallel using a pool of worker processes.
+
+        Decoding, resizing, drawing and encoding all happen in the workers.
+        Results are yielded as soon as each job finishes, so they do not
+        come back in submission order.
+        Args:
+            jobs (iterable): Dicts of keyword arguments for `make_meme`,
+                e.g. {'img_path': ..., 'text': ..., 'author': ...}.
+            workers (int): Number of worker processes.
+                Defaults to the number of CPUs.
+
+        Yields:
+            tuple: (job, path) pairs, where path is the saved meme image
+                or None if the job failed.
+        """
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(self.output_dir, self.worker_config())) as executor:
+            futures = {executor.submit(_run_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
@@ -0,0 +1,190 @@
+"""Module implementing per-stage timing metrics for meme generation."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+import time
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+                 16777216)
+
+_request_stages = ContextVar('request_stages', default=None)
+
+
+class Histogram:
+    """
+    A cumulative histogram in the Prometheus sense.
+
+    Attributes:
+        buckets (tuple): The upper bounds of the buckets.
+        counts (list): Observations per bucket, the last one being +Inf.
+        total (float): The sum of all observations.
+        count (int): The number of observations.
+    """
+
+    def __init__(self, buckets: tuple) -> None:
+        """
+        Create an empty Histogram object instance.
+
+        Args:
+            buckets (tuple): The upper bounds of the buckets, ascending.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): The observed value.
+        """
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list:
+        """
+        Render the histogram as Prometheus text exposition lines.
+
+        Args:
+            name (str): The metric name.
+            labels (str): The label pairs, e.g. 'stage="draw"'.
+
+        Returns:
+            list: The bucket, sum and count lines.
+        """
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class Metrics:
+    """
+    Records the duration and size of every stage of meme generation.
+
+    Observations are aggregated into histograms per stage, and also kept
+    per request when a request has been started, so they can be sent
+    back in a Server-Timing header.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty Metrics object instance."""
+        self._seconds = {}
+        self._bytes = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the body of a with statement as a pipeline stage.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Record the duration of a stage.
+
+        Args:
+            name (str): The name of the stage.
+            seconds (float): The duration of the stage.
+        """
+        with self._lock:
+            histogram = self._seconds.get(name)
+            if histogram is None:
+                histogram = self._seconds[name] = Histogram(SECONDS_BUCKETS)
+            histogram.observe(seconds)
+
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((name, seconds))
+
+    def observe_bytes(self, name: str, nbytes: int) -> None:
+        """
+        Record the number of bytes a stage produced or consumed.
+
+        Args:
+            name (str): The name of the stage.
+            nbytes (int): The number of bytes.
+        """
+        with self._lock:
+            histogram = self._bytes.get(name)
+            if histogram is None:
+                histogram = self._bytes[name] = Histogram(BYTES_BUCKETS)
+            histogram.observe(nbytes)
+
+    def begin_request(self) -> None:
+        """Start collecting the stages of the current request."""
+        _request_stages.set([])
+
+    def end_request(self) -> list:
+        """
+        Stop collecting the stages of the current request.
+
+        Returns:
+            list: (stage, seconds) pairs recorded during the request.
+        """
+        stages = _request_stages.get() or []
+        _request_stages.set(None)
+        return stages
+
+    @staticmethod
+    def server_timing(stages: list) -> str:
+        """
+        Format stages as the value of a Server-Timing header.
+
+        Repeated stages are summed.
+
+        Args:
+            stages (list): (stage, seconds) pairs.
+
+        Returns:
+            str: The header value, with durations in milliseconds.
+        """
+        totals = {}
+        for name, seconds in stages:
+            totals[name] = totals.get(name, 0) + seconds
+        return ', '.join(f'{name};dur={seconds * 1000:.2f}'
+                         for name, seconds in totals.items())
+
+    def render_prometheus(self) -> str:
+        """
+        Render all histograms in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page.
+        """
+        lines = []
+        families = (
+            ('meme_stage_seconds', 'Duration of meme generation stages.',
+             self._seconds),
+            ('meme_stage_bytes', 'Bytes handled by meme generation stages.',
+             self._bytes))
+        with self._lock:
+            for name, help_text, histograms in families:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for stage, histogram in sorted(histograms.items()):
+                    lines.extend(histogram.render(name, f'stage="{stage}"'))
+        return '\n'.join(lines) + '\n'
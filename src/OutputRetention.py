@@ -0,0 +1,200 @@
+"""Module implementing bounded retention of generated meme files."""
+from threading import Event, Lock, Thread
+import os
+import time
+import logging
+
+
+class OutputRetention:
+    """
+    Garbage collector keeping an output directory within its limits.
+
+    Files are evicted by modification time, oldest first, once the
+    directory holds more than max_files files or max_bytes bytes, and any
+    file older than max_age seconds is evicted. Writers that refresh the
+    modification time whenever they serve a file again, as `MemeEngine`
+    does, make this least recently used eviction. Files younger than
+    min_age seconds are never touched, so a meme is not removed before
+    the browser fetches it.
+    Attributes:
+        directory (str): The directory to keep within its limits.
+        max_files (int or None): Cap on the number of files.
+        max_bytes (int or None): Cap on the total size of the files.
+        max_age (float or None): Cap on the age of a file in seconds.
+        min_age (float): Grace period of a new file in seconds.
+        files_evicted (int): Number of files removed so far.
+        bytes_reclaimed (int): Number of bytes removed so far.
+        runs (int): Number of completed collection passes.
+        last_run_seconds (float): Duration of the last pass in seconds.
+    """
+
+    def __init__(self, directory: str, max_files: int = None,
+                 max_bytes: int = None, max_age: float = None,
+                 min_age: float = 60, interval: float = 30,
+                 batch_size: int = 100, on_evict=None) -> None:
+        """
+        Create an OutputRetention object instance.
+
+        Args:
+            directory (str): The directory to keep within its limits.
+            max_files (int): Cap on the number of files. Default None.
+            max_bytes (int): Cap on the total bytes of files. Default None.
+            max_age (float): Cap on the age of a file in seconds.
+                Defaults to None.
+            min_age (float): Grace period of a new file in seconds.
+                Defaults to 60.
+            interval (float): Seconds between background passes.
+                Defaults to 30.
+            batch_size (int): Files removed before yielding to other
+                threads. Defaults to 100.
+            on_evict (callable): Called with the path of each removed file.
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.min_age = min_age
+        self.interval = interval
+        self.batch_size = batch_size
+        self.on_evict = on_evict
+        self.files_evicted = 0
+        self.bytes_reclaimed = 0
+        self.runs = 0
+        self.last_run_seconds = 0.0
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    def _scan(self) -> list:
+        """
+        List the files of the directory, oldest first.
+
+        Hidden files, such as images still being written, are skipped.
+
+        Returns:
+            list: (mtime, size, path) tuples sorted by mtime.
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            return []
+        entries.sort()
+        return entries
+
+    def select_victims(self, entries: list, now: float) -> list:
+        """
+        Choose the files to evict according to the policy.
+
+        Args:
+            entries (list): (mtime, size, path) tuples sorted by mtime.
+            now (float): The current time as a UNIX timestamp.
+
+        Returns:
+            list: (mtime, size, path) tuples of the files to evict.
+        """
+        count = len(entries)
+        total = sum(size for _, size, _ in entries)
+        victims = []
+
+        for mtime, size, path in entries:
+            age = now - mtime
+            if age < self.min_age:
+                break
+            expired = self.max_age is not None and age > self.max_age
+            too_many = self.max_files is not None and count > self.max_files
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or too_many or too_big):
+                break
+            victims.append((mtime, size, path))
+            count -= 1
+            total -= size
+
+        return victims
+
+    def run_once(self) -> int:
+        """
+        Run one collection pass over the directory.
+
+        Returns:
+            int: The number of files removed.
+        """
+        start = time.perf_counter()
+        victims = self.select_victims(self._scan(), time.time())
+
+        removed = 0
+        for i, (_, size, path) in enumerate(victims):
+            if self._stop.is_set():
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logging.error(f"Error removing meme: {e.strerror}")
+                continue
+
+            removed += 1
+            with self._lock:
+                self.files_evicted += 1
+                self.bytes_reclaimed += size
+            if self.on_evict is not None:
+                self.on_evict(path)
+            if (i + 1) % self.batch_size == 0:
+                time.sleep(0)
+
+        with self._lock:
+            self.runs += 1
+            self.last_run_seconds = time.perf_counter() - start
+        return removed
+
+    def _loop(self) -> None:
+        """Run collection passes until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"Output retention pass failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start collecting in a background daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(
+            target=self._loop, name='output-retention', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        """
+        Return the retention counters.
+
+        Returns:
+            dict: The files evicted, bytes reclaimed, number of passes
+                and duration of the last pass.
+        """
+        with self._lock:
+            return {
+                'files_evicted': self.files_evicted,
+                'bytes_reclaimed': self.bytes_reclaimed,
+                'runs': self.runs,
+                'last_run_seconds': self.last_run_seconds,
+            }
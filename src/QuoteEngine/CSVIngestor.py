@@ -1,6 +1,7 @@
 """A concrete class for CSV files."""
-from typing import List
-import pandas
+from typing import Iterator, List
+import csv
+import sys
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
@@ -11,14 +12,43 @@ class CSVIngestor(IngestorInterface):
     allowed_extensions = ['csv']
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
-        """Parse a CSV file and returns a list of `QuoteModel` objects.
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """Parse a CSV file and yield `QuoteModel` objects.
 
         This method is required by the `IngestorInterface`
         and must be implemented by all concrete subclasses.
-        It reads in the CSV file at the given `path`,
-        creates a new `QuoteModel` instance  for each row in the file,
-        and returns a list of all the `QuoteModel` instances created.
+        It streams the CSV file at the given `path` through the
+        standard library reader, which handles quoted fields, and yields
+        a new `QuoteModel` instance for each row in the file.
+
+        Args:
+            path (str): The file path of the CSV file to parse.
+
+        Yields:
+            QuoteModel: The quotes in the CSV file, one per row.
+        """
+        if not cls.can_ingest(path):
+            raise Exception('cannot ingest exception')
+
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            body_col = header.index('body')
+            author_col = header.index('author')
+
+            for row in reader:
+                if row:
+                    yield QuoteModel(row[body_col], row[author_col])
+
+    @classmethod
+    def parse(cls, path: str) -> List[QuoteModel]:
+        """Parse a CSV file and returns a list of `QuoteModel` objects.
+
+        pandas is not imported for this. If another part of the process
+        has already loaded it, the columns are read in one vectorized call;
+        otherwise the rows are streamed by `iter_parse`.
 
         Args:
             path (str): The file path of the CSV file to parse.
@@ -27,14 +57,14 @@ class CSVIngestor(IngestorInterface):
             List[QuoteModel]: A list of `QuoteModel` instances
             representing the quotes in the CSV file.
         """
+        pandas = sys.modules.get('pandas')
+        if pandas is None:
+            return list(cls.iter_parse(path))
+
         if not cls.can_ingest(path):
             raise Exception('cannot ingest exception')
 
-        quotes = []
-        df = pandas.read_csv(path, header=0)
-
-        for index, row in df.iterrows():
-            new_quotes = QuoteModel(row['body'], row['author'])
-            quotes.append(new_quotes)
-
-        return quotes
+        df = pandas.read_csv(path, header=0, usecols=['body', 'author'],
+                             dtype=str, keep_default_na=False)
+        return list(map(QuoteModel, df['body'].tolist(),
+                        df['author'].tolist()))
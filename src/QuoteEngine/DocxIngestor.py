@@ -1,5 +1,5 @@
 """A concrete class for DOCX files."""
-from typing import List
+from typing import Iterator
 import docx
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
@@ -11,9 +11,12 @@ class DocxIngestor(IngestorInterface):
     allowed_extensions = ['docx']
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
         """
-        Parse a .docx file at a given path and return a list of QuoteModels.
+        Parse a .docx file at a given path and yield QuoteModels.
+
+        The document XML is loaded by python-docx, but paragraphs are
+        turned into quotes one at a time.
 
         Args:
             path (str): The path to the .docx file to be ingested.
@@ -22,20 +25,15 @@ class DocxIngestor(IngestorInterface):
             Exception: If the file at the given path has an extension
             that is not allowed by this class.
 
-        Returns:
-            A list of QuoteModel objects parsed from the .docx file.
+        Yields:
+            QuoteModel objects parsed from the .docx file.
         """
         if not cls.can_ingest(path):
             raise Exception('cannot ingest exception')
 
-        quotes = []
-
         doc = docx.Document(path)
 
         for para in doc.paragraphs:
             if para.text != "":
                 parse_list = para.text.split('-')
-                new_quote = QuoteModel(parse_list[0], parse_list[1])
-                quotes.append(new_quote)
-
-        return quotes
+                yield QuoteModel(parse_list[0], parse_list[1])
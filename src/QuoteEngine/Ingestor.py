@@ -1,45 +1,199 @@
 """Module implementing the ingestor logic."""
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Iterator, List, NamedTuple, Union
+import importlib
+import os
+import time
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
-from .DocxIngestor import DocxIngestor
-from .CSVIngestor import CSVIngestor
-from .PDFIngestor import PDFIngestor
-from .TextIngestor import TextIngestor
 import logging
 
 
+class ParseResult(NamedTuple):
+    """
+    The outcome of parsing one file with `Ingestor.parse_many`.
+
+    Attributes:
+    path (str): The parsed file.
+    quotes (List[QuoteModel]): The quotes found, empty on failure.
+    seconds (float): The time spent parsing the file.
+    error (str or None): The error message if parsing failed.
+    """
+
+    path: str
+    quotes: List[QuoteModel]
+    seconds: float
+    error: str = None
+
+
+def _timed_parse(path: str) -> ParseResult:
+    """
+    Parse one file, timing it and capturing any failure.
+
+    Parameters:
+    path (str): The path to the file to be ingested.
+
+    Returns:
+    A ParseResult for the file.
+    """
+    start = time.perf_counter()
+    try:
+        quotes = Ingestor.parse(path)
+        error = None
+    except Exception as e:
+        quotes = []
+        error = f"{type(e).__name__}: {e}"
+        logging.error(f"Failed to parse {path}: {error}")
+    return ParseResult(path, quotes, time.perf_counter() - start, error)
+
+
 class Ingestor(IngestorInterface):
     """
     Class for ingesting files and extracting quotes using importers.
 
+    Importers are registered by file extension, either as a class or as
+    a 'module:Class' string. A string is only imported the first time a
+    file with its extension is parsed, so importing this module does not
+    pull in python-docx, pandas or a PDF backend.
+
     Attributes:
-    importers (list): A list of importer classes that are used to ingest
-    different types of files.
+    registry (dict): The importer of each extension, as a class or as a
+    'module:Class' string, relative modules resolving in this package.
     """
 
-    importers = [DocxIngestor, CSVIngestor, PDFIngestor, TextIngestor]
+    registry = {
+        'docx': '.DocxIngestor:DocxIngestor',
+        'csv': '.CSVIngestor:CSVIngestor',
+        'pdf': '.PDFIngestor:PDFIngestor',
+        'txt': '.TextIngestor:TextIngestor',
+    }
+    _lock = Lock()
+
+    @classmethod
+    def register(cls, extension: str,
+                 importer: Union[str, type]) -> None:
+        """
+        Register the importer of a file extension.
+
+        A later registration of the same extension replaces the earlier
+        one, so third-party formats can also override a built-in one.
+
+        Parameters:
+        extension (str): The file extension, without the dot.
+        importer (str or type): An IngestorInterface subclass, or a
+            'module:Class' string naming one, imported on first use.
+        """
+        with cls._lock:
+            cls.registry[extension] = importer
+
+    @classmethod
+    def extensions(cls) -> List[str]:
+        """
+        Return the registered file extensions.
+
+        Returns:
+        A list of the extensions that can be ingested.
+        """
+        return list(cls.registry)
+
+    @classmethod
+    def can_ingest(cls, path: str) -> bool:
+        """
+        Return True if an importer is registered for the file extension.
+
+        Parameters:
+        path (str): The file path to check.
+
+        Returns:
+        True if the file can be ingested, False otherwise.
+        """
+        return path.split('.')[-1] in cls.registry
+
+    @classmethod
+    def list_files(cls, directory: str) -> List[str]:
+        """
+        List the ingestible files of a directory, sorted by name.
+
+        Callers sharing a QuoteIndex must list files the same way, since
+        the index is rebuilt whenever the list of files changes.
+
+        Parameters:
+        directory (str): The directory to list.
+
+        Returns:
+        The paths of the files that can be ingested.
+        """
+        files = []
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if cls.can_ingest(name) and os.path.isfile(path):
+                files.append(path)
+        return files
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def importer_for(cls, path: str):
         """
-        Ingest a file and extract quotes using appropriate importer.
+        Return the importer of a file, importing it if needed.
 
         Parameters:
         path (str): The path to the file to be ingested.
 
         Returns:
-        A list of QuoteModel objects extracted from the file.
+        The IngestorInterface subclass, or None if the file extension is
+        not registered.
         """
-        ingested = False
-        quotes = []
+        extension = path.split('.')[-1]
+        importer = cls.registry.get(extension)
+        if importer is None or isinstance(importer, type):
+            return importer
 
-        for importer in cls.importers:
-            if importer.can_ingest(path):
-                quotes = importer.parse(path)
-                ingested = True
+        with cls._lock:
+            importer = cls.registry.get(extension)
+            if isinstance(importer, str):
+                module_name, _, class_name = importer.partition(':')
+                module = importlib.import_module(module_name, __package__)
+                importer = getattr(module, class_name)
+                cls.registry[extension] = importer
+        return importer
 
-        if not ingested:
-            logging.error("Unsupported file ", path)
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Ingest a file and yield quotes using appropriate importer.
+
+        Parameters:
+        path (str): The path to the file to be ingested.
 
-        return quotes
+        Yields:
+        The QuoteModel objects extracted from the file, one by one.
+        """
+        importer = cls.importer_for(path)
+        if importer is None:
+            logging.error(f"Unsupported file {path}")
+            return
+
+        yield from importer.iter_parse(path)
+
+    @classmethod
+    def parse_many(cls, paths: List[str], workers: int = 4,
+                   use_processes: bool = False) -> List[ParseResult]:
+        """
+        Ingest several files concurrently.
+
+        Threads suit the PDF ingestor, which waits on a subprocess;
+        processes suit the CPU-bound CSV and DOCX ingestors.
+
+        Parameters:
+        paths (List[str]): The paths to the files to be ingested.
+        workers (int): The number of concurrent workers. Defaults to 4.
+        use_processes (bool): Use a process pool instead of a thread pool.
+            Defaults to False.
+
+        Returns:
+        A list of ParseResult, one per path and in the order of paths.
+        """
+        executor_class = ProcessPoolExecutor if use_processes \
+            else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            return list(executor.map(_timed_parse, paths))
@@ -1,6 +1,6 @@
 """Module implementing the ABC interface to ingest different files."""
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List
 from .QuoteModel import QuoteModel
 
 
@@ -25,12 +25,26 @@ class IngestorInterface(ABC):
 
     @classmethod
     @abstractmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
         """
-        Parse the file at the given path and returns a list of QuoteModels.
+        Parse the file at the given path and yield its QuoteModels.
 
         This is an abstract method and must be implemented by any concrete
-        subclass of IngestorInterface.
+        subclass of IngestorInterface. Implementations read the file
+        incrementally, so a file of any size is parsed in constant memory.
+
+        Args:
+            path (str): The file path to parse.
+
+        Yields:
+            QuoteModel: The quotes parsed from the file, one by one.
+        """
+        pass
+
+    @classmethod
+    def parse(cls, path: str) -> List[QuoteModel]:
+        """
+        Parse the file at the given path and returns a list of QuoteModels.
 
         Args:
             path (str): The file path to parse.
@@ -39,4 +53,4 @@ class IngestorInterface(ABC):
             List[QuoteModel]: A list of QuoteModel objects
             parsed from the file.
         """
-        pass
+        return list(cls.iter_parse(path))
@@ -1,8 +1,8 @@
 """A concrete class for PDF files."""
-from typing import List
-import subprocess
+from typing import Iterator
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
+from .PDFTextExtractor import PDFTextExtractor
 
 
 class PDFIngestor(IngestorInterface):
@@ -11,16 +11,17 @@ class PDFIngestor(IngestorInterface):
     allowed_extensions = ['pdf']
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
         """
-        Parse a PDF file and returns a list of QuoteModel objects.
+        Parse a PDF file and yield QuoteModel objects.
+
+        Lines are streamed page by page from `PDFTextExtractor`.
 
         Args:
             path (str): The path to the PDF file.
 
-        Returns:
-            List[QuoteModel]: A list of QuoteModel objects
-            representing the quotes in the file.
+        Yields:
+            QuoteModel: The quotes in the file, one per non-empty line.
 
         Raises:
             Exception: If the file cannot be ingested.
@@ -28,14 +29,9 @@ class PDFIngestor(IngestorInterface):
         if not cls.can_ingest(path):
             raise Exception('Cannot Ingest Exception')
 
-        p = subprocess.Popen(
-            ['pdftotext', '-layout', path, '-'], stdout=subprocess.PIPE)
-        quotes = []
-        for line in p.stdout:
-            line = line.decode('utf-8').strip()
+        for line in PDFTextExtractor.iter_lines(path):
+            line = line.strip()
 
             if len(line) > 0:
                 body, author = line.split('-')
-                quotes.append(QuoteModel(body, author))
-
-        return quotes
+                yield QuoteModel(body, author)
@@ -0,0 +1,194 @@
+"""Module extracting the text of PDF files line by line."""
+from typing import Iterator, List
+import logging
+import subprocess
+import threading
+import time
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+
+class StallWatchdog(threading.Thread):
+    """
+    Calls an action once it has been armed for longer than a timeout.
+
+    Arming restarts the clock and disarming stops it, so only the time
+    spent waiting on the watched work is counted.
+    Attributes:
+        timeout (float): Seconds the watchdog may stay armed.
+        action (callable): Called without arguments when it expires.
+        fired (bool): Whether the action was called.
+    """
+
+    def __init__(self, timeout: float, action) -> None:
+        """
+        Create a disarmed StallWatchdog object instance.
+
+        Args:
+            timeout (float): Seconds the watchdog may stay armed.
+            action (callable): Called when it expires.
+        """
+        super().__init__(daemon=True)
+        self.timeout = timeout
+        self.action = action
+        self.fired = False
+        self._armed_at = None
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def arm(self) -> None:
+        """Start counting from now."""
+        with self._cond:
+            self._armed_at = time.monotonic()
+            self._cond.notify()
+
+    def disarm(self) -> None:
+        """Stop counting."""
+        with self._cond:
+            self._armed_at = None
+
+    def close(self) -> None:
+        """Stop the watchdog thread without calling the action."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def run(self) -> None:
+        """Wait for the armed time to exceed the timeout."""
+        with self._cond:
+            while not self._closed:
+                if self._armed_at is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._armed_at + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    self.fired = True
+                    self.action()
+                    return
+                self._cond.wait(remaining)
+
+
+class PDFTextExtractor:
+    """
+    Extracts the text of a PDF, streaming it one line at a time.
+
+    Two backends are available. `pypdf`, when installed, extracts text
+    in-process page by page, so no process is spawned per file. The
+    `pdftotext` backend runs the poppler CLI, reads its stdout as it is
+    produced, kills it once it stalls for `timeout` seconds without
+    output and always reaps it.
+
+    The pypdf backend cannot be interrupted while it extracts a page;
+    the time spent extracting is added up and checked against `timeout`
+    between pages. Neither backend counts the time the caller takes to
+    consume the lines, so large files can be streamed. In 'auto' mode a
+    file on which pypdf fails or runs out of time is finished by
+    pdftotext, starting at the first page pypdf did not complete, so no
+    line is yielded twice.
+
+    Attributes:
+    backend (str): 'auto', 'pypdf' or 'pdftotext'. 'auto' prefers pypdf
+    and falls back to pdftotext.
+    timeout (float): Seconds pypdf may spend extracting one file, and
+    seconds pdftotext may go without output.
+    """
+
+    backend = 'auto'
+    timeout = 30
+
+    @classmethod
+    def iter_lines(cls, path: str) -> Iterator[str]:
+        """
+        Yield the lines of text of a PDF file.
+
+        Args:
+            path (str): The path to the PDF file.
+
+        Yields:
+            str: Each line of text, without its line ending.
+        """
+        if cls.backend == 'pdftotext' or \
+                (cls.backend == 'auto' and pypdf is None):
+            yield from cls._iter_pdftotext(path)
+            return
+
+        pages_done = 0
+        try:
+            for lines in cls._iter_pypdf_pages(path):
+                yield from lines
+                pages_done += 1
+            return
+        except Exception as e:
+            if cls.backend == 'pypdf':
+                raise
+            logging.warning(f"pypdf failed on {path} after {pages_done} "
+                            f"pages, falling back to pdftotext: {str(e)}")
+        yield from cls._iter_pdftotext(path, first_page=pages_done + 1)
+
+    @classmethod
+    def _iter_pypdf_pages(cls, path: str) -> Iterator[List[str]]:
+        """
+        Yield the lines of each page of a PDF, extracted with pypdf.
+
+        Only the time spent parsing and extracting counts towards
+        `timeout`, not the time the caller takes between pages.
+        """
+        if pypdf is None:
+            raise Exception('pypdf is not installed')
+
+        with open(path, 'rb') as f:
+            start = time.monotonic()
+            reader = pypdf.PdfReader(f)
+            pages = iter(reader.pages)
+            spent = time.monotonic() - start
+            while True:
+                start = time.monotonic()
+                page = next(pages, None)
+                if page is None:
+                    return
+                if spent > cls.timeout:
+                    raise Exception(f'pypdf timed out after {cls.timeout}s')
+                lines = page.extract_text().splitlines()
+                spent += time.monotonic() - start
+                yield lines
+
+    @classmethod
+    def _iter_pdftotext(cls, path: str,
+                        first_page: int = 1) -> Iterator[str]:
+        """
+        Yield the lines of a PDF from a pdftotext subprocess.
+
+        The process is killed when it goes `timeout` seconds without
+        output while a line is awaited; a caller slow to consume lines
+        does not count against it.
+        """
+        p = subprocess.Popen(
+            ['pdftotext', '-layout', '-f', str(first_page), path, '-'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        watchdog = StallWatchdog(cls.timeout, p.kill)
+        watchdog.start()
+        try:
+            while True:
+                watchdog.arm()
+                line = p.stdout.readline()
+                watchdog.disarm()
+                if not line:
+                    break
+                yield line.decode('utf-8').rstrip('\r\n')
+            watchdog.arm()
+            returncode = p.wait()
+        finally:
+            watchdog.close()
+            if p.poll() is None:
+                p.kill()
+            p.stdout.close()
+            p.wait()
+
+        if watchdog.fired:
+            raise Exception(
+                f'pdftotext produced no output for {cls.timeout}s')
+        if returncode != 0:
+            raise Exception(f'pdftotext failed with exit code {returncode}')
@@ -0,0 +1,177 @@
+"""Module implementing a compact, columnar store of quotes."""
+from array import array
+from collections.abc import Sequence
+import json
+import mmap
+import struct
+import sys
+from .QuoteModel import QuoteModel
+
+MAGIC = b'QCRP'
+VERSION = 1
+PREAMBLE = struct.Struct('<4sII')
+
+
+def _padding(offset: int) -> bytes:
+    """Return the zero bytes aligning offset to 8 bytes."""
+    return b'\0' * (-offset % 8)
+
+
+class QuoteCorpus(Sequence):
+    """
+    A read-only sequence of quotes stored in contiguous columns.
+
+    All bodies live in one UTF-8 buffer indexed by a uint64 offset table,
+    and each quote refers to its author through a uint32 index into a
+    table of unique author strings. A `QuoteModel` is only built when a
+    quote is accessed, in O(1), so `random.choice` works as on a list.
+    A corpus opened from a file is memory-mapped read-only, so forked
+    workers share its pages instead of each holding a copy.
+    """
+
+    def __init__(self, bodies, body_offsets, authors: list,
+                 author_ids) -> None:
+        """
+        Create a QuoteCorpus object instance from its columns.
+
+        Args:
+            bodies (bytes-like): The UTF-8 bodies, concatenated.
+            body_offsets (Sequence[int]): Start of each body in bodies,
+                with the end of the last body appended.
+            authors (list): The unique author strings.
+            author_ids (Sequence[int]): Index in authors of each quote.
+        """
+        self._bodies = memoryview(bodies)
+        self._body_offsets = body_offsets
+        self._authors = authors
+        self._author_ids = author_ids
+
+    @classmethod
+    def from_quotes(cls, quotes) -> 'QuoteCorpus':
+        """
+        Build an in-memory corpus from QuoteModel objects.
+
+        Args:
+            quotes (iterable): The quotes to store.
+
+        Returns:
+            QuoteCorpus: The corpus holding the quotes.
+        """
+        bodies = bytearray()
+        body_offsets = array('Q', [0])
+        authors = []
+        author_index = {}
+        author_ids = array('I')
+
+        for quote in quotes:
+            bodies += str(quote.body).encode('utf-8')
+            body_offsets.append(len(bodies))
+            author = str(quote.author)
+            if author not in author_index:
+                author_index[author] = len(authors)
+                authors.append(sys.intern(author))
+            author_ids.append(author_index[author])
+
+        return cls(bytes(bodies), body_offsets, authors, author_ids)
+
+    @classmethod
+    def open(cls, path: str):
+        """
+        Memory-map a corpus file written by `write`.
+
+        Args:
+            path (str): The path of the corpus file.
+
+        Raises:
+            ValueError: If the file is not a corpus file.
+
+        Returns:
+            tuple: The corpus and the header dict stored with it.
+        """
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_len = PREAMBLE.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('unsupported quote corpus format')
+
+        offset = PREAMBLE.size
+        header = json.loads(buffer[offset:offset + header_len])
+        offset += header_len
+        offset += len(_padding(offset))
+        count = header['count']
+
+        view = memoryview(buffer)
+        body_offsets = view[offset:offset + 8 * (count + 1)]
+        offset += 8 * (count + 1)
+        author_ids = view[offset:offset + 4 * count]
+        offset += 4 * count
+        offset += len(_padding(offset))
+
+        if sys.byteorder == 'little':
+            body_offsets = body_offsets.cast('Q')
+            author_ids = author_ids.cast('I')
+        else:
+            body_offsets = array('Q', body_offsets.tobytes())
+            author_ids = array('I', author_ids.tobytes())
+            body_offsets.byteswap()
+            author_ids.byteswap()
+
+        bodies = view[offset:offset + body_offsets[count]]
+        authors = [sys.intern(author) for author in header['authors']]
+        return cls(bodies, body_offsets, authors, author_ids), header
+
+    def write(self, f, **header) -> None:
+        """
+        Write the corpus to a binary file, in the format read by `open`.
+
+        Args:
+            f (file): A binary file object opened for writing.
+            **header: Extra JSON-serializable fields stored with the corpus.
+        """
+        header = dict(header, count=len(self), authors=self._authors)
+        encoded = json.dumps(header).encode('utf-8')
+
+        body_offsets = array('Q', self._body_offsets)
+        author_ids = array('I', self._author_ids)
+        if sys.byteorder != 'little':
+            body_offsets.byteswap()
+            author_ids.byteswap()
+
+        offset = PREAMBLE.size + len(encoded)
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(encoded)))
+        f.write(encoded)
+        f.write(_padding(offset))
+        offset += len(_padding(offset))
+        f.write(body_offsets.tobytes())
+        f.write(author_ids.tobytes())
+        offset += 8 * len(body_offsets) + 4 * len(author_ids)
+        f.write(_padding(offset))
+        f.write(self._bodies)
+
+    def __len__(self):
+        """Return the number of quotes."""
+        return len(self._author_ids)
+
+    def __getitem__(self, index):
+        """
+        Return the quote at an index, or a list of quotes for a slice.
+
+        Args:
+            index (int or slice): The position of the quote(s).
+
+        Returns:
+            QuoteModel or list: The quote(s) at the position.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('quote index out of range')
+
+        start = self._body_offsets[index]
+        end = self._body_offsets[index + 1]
+        return QuoteModel(str(self._bodies[start:end], 'utf-8'),
+                          self._authors[self._author_ids[index]])
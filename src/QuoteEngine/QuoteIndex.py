@@ -0,0 +1,166 @@
+"""Module implementing a persistent, pre-parsed index of quote files."""
+from typing import List
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+from .QuoteCorpus import QuoteCorpus
+from .Ingestor import Ingestor
+
+
+class QuoteIndex:
+    """
+    A compiled index of the quotes of a set of quote files.
+
+    The index file is a `QuoteCorpus` file whose header also holds a
+    manifest of the source files. Loading it is a single memory map and
+    needs none of the parsing libraries. A source file is only parsed
+    again when its modification time or size changes and its SHA-256 no
+    longer matches.
+    Files that fail to parse are left out and retried on the next load.
+    Attributes:
+        index_path (str): The path of the index file.
+        reparsed (list): Source files parsed during the last load.
+    """
+
+    def __init__(self, index_path: str = './_data/.quote_index') -> None:
+        """
+        Create a QuoteIndex object instance.
+
+        Args:
+            index_path (str): The path of the index file.
+                Defaults to './_data/.quote_index'.
+        """
+        self.index_path = index_path
+        self.reparsed = []
+
+    def load(self, paths: List[str]) -> QuoteCorpus:
+        """
+        Return the quotes of the given files, rebuilding the index if stale.
+
+        Args:
+            paths (List[str]): The quote files, in the order their quotes
+                should appear.
+
+        Returns:
+            QuoteCorpus: The quotes of all files.
+        """
+        self.reparsed = []
+        manifest, quotes = self.read()
+        sources = {source['path']: source for source in manifest}
+
+        stats = {path: os.stat(path) for path in paths}
+        if [source['path'] for source in manifest] == list(paths) and all(
+                self._unchanged(sources[path], stats[path])
+                for path in paths):
+            return quotes
+
+        reusable = {}
+        digests = {}
+        for path in paths:
+            source = sources.get(path)
+            if source is None:
+                continue
+            if not self._unchanged(source, stats[path]):
+                digests[path] = self._digest(path)
+                if digests[path] != source['sha256']:
+                    continue
+            reusable[path] = source
+
+        self.reparsed = [path for path in paths if path not in reusable]
+        parsed = {result.path: result
+                  for result in self._parse_many(self.reparsed)}
+
+        new_manifest = []
+        new_quotes = []
+        for path in paths:
+            stat = stats[path]
+            source = reusable.get(path)
+            if source is not None:
+                start = source['start']
+                file_quotes = quotes[start:start + source['count']]
+                digest = source['sha256']
+            elif parsed[path].error is None:
+                file_quotes = parsed[path].quotes
+                digest = digests.get(path) or self._digest(path)
+            else:
+                continue
+
+            new_manifest.append({
+                'path': path, 'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size, 'sha256': digest,
+                'start': len(new_quotes), 'count': len(file_quotes)})
+            new_quotes.extend(file_quotes)
+
+        corpus = QuoteCorpus.from_quotes(new_quotes)
+        if self.write(new_manifest, corpus):
+            return self.read()[1]
+        return corpus
+
+    @staticmethod
+    def _unchanged(source: dict, stat: os.stat_result) -> bool:
+        """Return True if a file still has its indexed mtime and size."""
+        return source['mtime_ns'] == stat.st_mtime_ns and \
+            source['size'] == stat.st_size
+
+    @staticmethod
+    def _digest(path: str) -> str:
+        """Return the SHA-256 hex digest of a file."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _parse_many(paths: List[str]) -> list:
+        """Parse quote files, without starting a pool if there are none."""
+        if not paths:
+            return []
+        return Ingestor.parse_many(paths)
+
+    def read(self):
+        """
+        Read the index file.
+
+        Returns:
+            tuple: The manifest of source files and the QuoteCorpus,
+                or an empty manifest and corpus if there is no valid index.
+        """
+        try:
+            corpus, header = QuoteCorpus.open(self.index_path)
+            return header['sources'], corpus
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, struct.error) as e:
+            logging.error(f"Ignoring invalid quote index: {str(e)}")
+        return [], QuoteCorpus.from_quotes([])
+
+    def write(self, manifest: list, corpus: QuoteCorpus) -> bool:
+        """
+        Write the index file atomically.
+
+        Args:
+            manifest (list): The indexed source files.
+            corpus (QuoteCorpus): The quotes of all source files.
+
+        Returns:
+            bool: True if the index file was written.
+        """
+        directory = os.path.dirname(self.index_path) or '.'
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except OSError as e:
+            logging.error(f"Error writing quote index: {e.strerror}")
+            return False
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                corpus.write(f, sources=manifest)
+            os.replace(tmp_path, self.index_path)
+            return True
+        except OSError as e:
+            logging.error(f"Error writing quote index: {e.strerror}")
+            os.remove(tmp_path)
+            return False
@@ -5,8 +5,11 @@ class QuoteModel:
     """A class that represents a quote.
 
     A quote consists of a body and an author.
+    Slots keep the per-quote memory overhead small.
     """
 
+    __slots__ = ('body', 'author')
+
     def __init__(self, body: str, author: str = 'unknown'):
         """Create a new `QuoteModel` instance.
 
@@ -1,5 +1,5 @@
 """A concrete class for TXT files."""
-from typing import List
+from typing import Iterator
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
@@ -10,16 +10,15 @@ class TextIngestor(IngestorInterface):
     allowed_extensions = ['txt']
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
         """
-        Parse a .txt file and returns a list of QuoteModel objects.
+        Parse a .txt file line by line and yield QuoteModel objects.
 
         Args:
             path (str): The path to the .txt file.
 
-        Returns:
-            List[QuoteModel]: A list of QuoteModel objects
-            representing the quotes in the file.
+        Yields:
+            QuoteModel: The quotes in the file, one per non-empty line.
 
         Raises:
             Exception: If the file cannot be ingested.
@@ -27,12 +26,9 @@ class TextIngestor(IngestorInterface):
         if not cls.can_ingest(path):
             raise Exception('cannot ingest exception')
 
-        quotes = []
-
         with open(path, 'r', encoding='utf-8-sig') as f:
             for line in f:
+                if not line.strip():
+                    continue
                 parts_list = line.split('-')
-                new_quote = QuoteModel(parts_list[0], parts_list[1])
-                quotes.append(new_quote)
-
-        return quotes
+                yield QuoteModel(parts_list[0], parts_list[1])
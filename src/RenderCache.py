@@ -0,0 +1,172 @@
+"""Module implementing an LRU cache of fully rendered meme files."""
+from collections import OrderedDict
+from threading import Lock
+import os
+import logging
+
+
+class RenderCache:
+    """
+    An LRU index of rendered meme files on disk.
+
+    Entries map a meme key to the file holding the rendered meme.
+    When the number of entries or the bytes on disk exceed their cap,
+    the least recently used entries are dropped, and their files are
+    deleted if this process wrote them. Files found on disk but written
+    by another process are only forgotten, since that process may still
+    be serving them. A hit whose file has since been removed counts as
+    a miss.
+    Attributes:
+        max_entries (int or None): Cap on the number of cached memes.
+        max_bytes (int or None): Cap on the bytes of cached memes on disk.
+        current_bytes (int): The bytes of cached memes on disk.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups not found in the cache.
+        evictions (int): Number of files evicted to respect the caps.
+    """
+
+    def __init__(self, max_entries: int = 1024,
+                 max_bytes: int = None) -> None:
+        """
+        Create a RenderCache object instance.
+
+        Args:
+            max_entries (int): Cap on the number of cached memes.
+                Defaults to 1024. None means no cap.
+            max_bytes (int): Cap on the bytes of cached memes on disk.
+                Defaults to None, meaning no cap.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str):
+        """
+        Look up a rendered meme and mark it as most recently used.
+
+        Args:
+            key (str): The meme key.
+
+        Returns:
+            str or None: The path of the rendered meme, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not os.path.exists(entry[0]):
+                del self._entries[key]
+                self.current_bytes -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, path: str, owned: bool = True) -> None:
+        """
+        Record a rendered meme, evicting old files if a cap is exceeded.
+
+        Args:
+            key (str): The meme key.
+            path (str): The path of the rendered meme.
+            owned (bool): Whether this process wrote the file, and so may
+                delete it on eviction. Defaults to True.
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (path, size, owned)
+            self.current_bytes += size
+            evicted = self._evict()
+
+        self._remove_files(evicted)
+
+    def discard(self, path: str) -> None:
+        """
+        Forget a rendered meme whose file was removed by someone else.
+
+        Args:
+            path (str): The path of the removed meme.
+        """
+        key = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == path:
+                del self._entries[key]
+                self.current_bytes -= entry[1]
+
+    def _over_cap(self) -> bool:
+        """Return True if the cache holds more than one of its caps."""
+        if self.max_entries is not None and \
+                len(self._entries) > self.max_entries:
+            return True
+        if self.max_bytes is not None and \
+                self.current_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _evict(self) -> list:
+        """
+        Drop least recently used entries until the caps are respected.
+
+        Must be called with the lock held.
+
+        Returns:
+            list: Paths of the files this process wrote, to delete.
+        """
+        evicted = []
+        while self._entries and self._over_cap():
+            _, (path, size, owned) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+            if owned:
+                evicted.append(path)
+        return evicted
+
+    def _remove_files(self, paths) -> None:
+        """
+        Delete evicted files from disk.
+
+        Args:
+            paths (list): Paths of the files to delete.
+        """
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Error removing cached meme: {e.strerror}")
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The hit, miss and eviction counters with the
+                current number of entries and bytes on disk.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+            }
+
+    def __len__(self):
+        """Return the number of cached memes."""
+        return len(self._entries)
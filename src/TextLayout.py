@@ -0,0 +1,238 @@
+"""Module implementing measured, cached line wrapping of meme captions."""
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple, Tuple
+from FontRegistry import fonts as default_fonts
+
+SHRINK_STEP = 2
+
+
+class Layout(NamedTuple):
+    """
+    The lines of a caption laid out in a box.
+
+    Attributes:
+        lines (tuple): The wrapped lines, top to bottom.
+        font_size (int): The font size the lines were measured with,
+            smaller than the requested one if the text was shrunk.
+        line_height (int): The distance between two baselines in pixels.
+        width (int): The width of the widest line in pixels.
+        height (int): The height of all lines in pixels.
+    """
+
+    lines: Tuple[str, ...]
+    font_size: int
+    line_height: int
+    width: int
+    height: int
+
+
+class GlyphTable:
+    """
+    The advance widths of the characters of one font face.
+
+    Each character is measured with the font once, after which the
+    width of any text is a sum of table lookups.
+    Attributes:
+        font (PIL.ImageFont.FreeTypeFont): The measured font.
+        line_height (int): The ascent plus descent of the font.
+        advances (dict): The advance width of each character seen.
+    """
+
+    def __init__(self, font) -> None:
+        """
+        Create an empty GlyphTable object instance.
+
+        Args:
+            font (PIL.ImageFont.FreeTypeFont): The font to measure.
+        """
+        self.font = font
+        ascent, descent = font.getmetrics()
+        self.line_height = ascent + descent
+        self.advances = {}
+
+    def measure(self, text: str) -> float:
+        """
+        Return the width of a text in pixels.
+
+        Args:
+            text (str): The text to measure.
+
+        Returns:
+            float: The sum of the advance widths of its characters.
+        """
+        advances = self.advances
+        width = 0
+        for char in text:
+            advance = advances.get(char)
+            if advance is None:
+                advance = advances[char] = self.font.getlength(char)
+            width += advance
+        return width
+
+
+class TextLayoutEngine:
+    """
+    Wraps captions by their real pixel width and caches the result.
+
+    Text is broken at spaces so that every line fits the box width, and
+    words wider than the box are broken between characters. When a box
+    height is given the font size is reduced until the lines fit it.
+    Finished layouts are kept in an LRU cache keyed on the text, font,
+    size and box, since the same quotes are drawn over and over.
+    Attributes:
+        fonts (FontRegistry): The pool the fonts are loaded from.
+        max_entries (int): Cap on the number of cached layouts.
+        hits (int): Number of layouts served from the cache.
+        misses (int): Number of layouts computed.
+    """
+
+    def __init__(self, fonts=default_fonts, max_entries: int = 4096) -> None:
+        """
+        Create a TextLayoutEngine object instance.
+
+        Args:
+            fonts (FontRegistry): The pool to load fonts from.
+                Defaults to the process-wide registry.
+            max_entries (int): Cap on the number of cached layouts.
+                Defaults to 4096.
+        """
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._tables = {}
+        self._layouts = OrderedDict()
+        self._lock = Lock()
+
+    def glyphs(self, font_path: str, size: int) -> GlyphTable:
+        """
+        Return the glyph table of a font face, creating it if needed.
+
+        Args:
+            font_path (str): The path to the font file.
+            size (int): The font size.
+
+        Returns:
+            GlyphTable: The advance widths of the face.
+        """
+        key = (font_path, size)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables.setdefault(
+                key, GlyphTable(self.fonts.get(font_path, size)))
+        return table
+
+    def wrap(self, text: str, font_path: str, size: int,
+             max_width: int) -> list:
+        """
+        Break a text into lines no wider than max_width.
+
+        Args:
+            text (str): The text to wrap.
+            font_path (str): The path to the font file.
+            size (int): The font size.
+            max_width (int): The width of the box in pixels.
+
+        Returns:
+            list: The lines, each at most max_width wide unless a single
+                character is wider than the box.
+        """
+        table = self.glyphs(font_path, size)
+        space = table.measure(' ')
+        lines = []
+        line = ''
+        line_width = 0
+
+        for word in text.split():
+            word_width = table.measure(word)
+            if line and line_width + space + word_width <= max_width:
+                line += ' ' + word
+                line_width += space + word_width
+                continue
+            if line:
+                lines.append(line)
+
+            while word_width > max_width and len(word) > 1:
+                cut = 1
+                head_width = table.measure(word[0])
+                while cut < len(word):
+                    advance = table.measure(word[cut])
+                    if head_width + advance > max_width:
+                        break
+                    head_width += advance
+                    cut += 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = table.measure(word)
+            line, line_width = word, word_width
+
+        if line:
+            lines.append(line)
+        return lines
+
+    def layout(self, text: str, font_path: str, size: int, max_width: int,
+               max_height: int = None, min_size: int = None) -> Layout:
+        """
+        Lay out a text in a box, shrinking it to fit if allowed.
+
+        Args:
+            text (str): The text to lay out.
+            font_path (str): The path to the font file.
+            size (int): The preferred font size.
+            max_width (int): The width of the box in pixels.
+            max_height (int): The height of the box in pixels.
+                Defaults to None, meaning the text may be any height.
+            min_size (int): The smallest font size to shrink to.
+                Defaults to None, meaning the text is never shrunk.
+
+        Returns:
+            Layout: The lines and their dimensions. The text may still
+                overflow max_height if it does not fit at min_size.
+        """
+        key = (text, font_path, size, max_width, max_height, min_size)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+                return layout
+            self.misses += 1
+
+        smallest = size if min_size is None else min(min_size, size)
+        while True:
+            lines = self.wrap(text, font_path, size, max_width)
+            table = self.glyphs(font_path, size)
+            height = table.line_height * len(lines)
+            if max_height is None or height <= max_height or \
+                    size <= smallest:
+                break
+            size = max(smallest, size - SHRINK_STEP)
+
+        layout = Layout(tuple(lines), size, table.line_height,
+                        round(max(map(table.measure, lines), default=0)),
+                        height)
+        with self._lock:
+            self._layouts[key] = layout
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+        return layout
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The hit and miss counters with the number of cached
+                layouts and measured faces.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._layouts),
+                'faces': len(self._tables),
+            }
+
+
+layouts = TextLayoutEngine()
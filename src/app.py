@@ -1,45 +1,91 @@
 """Flask application for meme generation in Random and Creator modes."""
 import random
 import os
+import base64
 import requests
-from flask import Flask, render_template, request
-from MemeEngine import MemeEngine
-from QuoteEngine.Ingestor import Ingestor
-import tempfile
+from flask import Flask, render_template, request, abort, url_for, jsonify
+from MemeEngine import MemeEngine, DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE, \
+    DEFAULT_MAX_WIDTH
+from RenderCache import RenderCache
+from ImageFetcher import ImageFetcher, ImageFetchError
+from FetchCache import FetchCache
+from Catalog import Catalog
+from Metrics import Metrics
+from EncodingProfile import PROFILES
 import logging
 
 app = Flask(__name__)
-
-meme = MemeEngine('./static')
-
-
-def setup():
-    """Load all resources.
+app.config['MEME_FROM_MEMORY'] = os.environ.get('MEME_FROM_MEMORY') == '1'
+app.config['MEME_METRICS'] = os.environ.get('MEME_METRICS') == '1'
+
+LAYOUT_SEEDS = 4
+RENDER_CACHE_ENTRIES = 512
+OUTPUT_MAX_FILES = 2000
+OUTPUT_MAX_AGE = 24 * 60 * 60
+FETCH_CACHE_BYTES = 128 * 1024 * 1024
+# Offered in order of preference when the client accepts them equally,
+# so a client sending only */* gets the first one.
+OUTPUT_PROFILES = [PROFILES['jpeg'], PROFILES['webp']]
+
+metrics = Metrics() if app.config['MEME_METRICS'] else None
+meme = MemeEngine('./static',
+                  result_cache=RenderCache(max_entries=RENDER_CACHE_ENTRIES),
+                  metrics=metrics)
+meme.fonts.preload([(DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE)])
+meme.enable_retention(max_files=OUTPUT_MAX_FILES, max_age=OUTPUT_MAX_AGE)
+fetcher = ImageFetcher(cache=FetchCache(FETCH_CACHE_BYTES))
+catalog = Catalog('./_data/DogQuotes/', './_data/photos/dog/')
+catalog.start()
+
+
+@app.before_request
+def start_timing():
+    """Start collecting stage timings for the request."""
+    if metrics is not None:
+        metrics.begin_request()
+
+
+@app.after_request
+def add_server_timing(response):
+    """Send the stage timings of the request in a Server-Timing header.
 
     Returns:
-    tuple: A tuple containing two lists, quotes and imgs.
-    quotes contains all the quotes parsed from various files,
-    and imgs contains the paths of all images in the _data/photos/dog/.
+        Response: The response, with the header added if metrics are on.
     """
-    quote_files = ['./_data/DogQuotes/DogQuotesTXT.txt',
-                   './_data/DogQuotes/DogQuotesDOCX.docx',
-                   './_data/DogQuotes/DogQuotesPDF.pdf',
-                   './_data/DogQuotes/DogQuotesCSV.csv']
+    if metrics is not None:
+        stages = metrics.end_request()
+        if stages:
+            response.headers['Server-Timing'] = \
+                metrics.server_timing(stages)
+    return response
 
-    quotes = []
-    for f in quote_files:
-        quotes.extend(Ingestor.parse(f))
 
-    images_path = "./_data/photos/dog/"
+def negotiate_profile():
+    """Pick the output encoding from the Accept header of the request.
 
-    imgs = []
-    for root, dirs, files in os.walk(images_path):
-        imgs = [os.path.join(root, name) for name in files]
+    Returns:
+        EncodingProfile: The preferred profile the client accepts, or the
+        first profile if it accepts none of them.
+    """
+    mimetype = request.accept_mimetypes.best_match(
+        [profile.mimetype for profile in OUTPUT_PROFILES])
+    for profile in OUTPUT_PROFILES:
+        if profile.mimetype == mimetype:
+            return profile
+    return OUTPUT_PROFILES[0]
 
-    return quotes, imgs
 
+@app.route('/metrics')
+def metrics_page():
+    """Expose the stage histograms in Prometheus text format.
 
-quotes, imgs = setup()
+    Returns:
+        Response: The metrics page, or 404 if metrics are disabled.
+    """
+    if metrics is None:
+        abort(404)
+    return app.response_class(metrics.render_prometheus(),
+                              mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/')
@@ -49,10 +95,70 @@ def meme_rand():
     Returns:
         str: HTML template with a randomly generated meme.
     """
-    img = random.choice(imgs)
-    quote = random.choice(quotes)
-    path = meme.make_meme(img, quote.body, quote.author)
-    return render_template('meme.html', path=path)
+    snapshot = catalog.snapshot
+    if app.config['MEME_FROM_MEMORY']:
+        path = url_for(
+            'meme_image', img_id=random.randrange(len(snapshot.imgs)),
+            quote_id=random.randrange(len(snapshot.quotes)),
+            seed=random.randrange(LAYOUT_SEEDS))
+        return render_template('meme.html', path=path)
+
+    img = random.choice(snapshot.imgs)
+    quote = random.choice(snapshot.quotes)
+    seed = random.randrange(LAYOUT_SEEDS)
+    path = meme.make_meme(img, quote.body, quote.author, seed=seed,
+                          profile=negotiate_profile())
+    response = app.make_response(render_template('meme.html', path=path))
+    response.vary.add('Accept')
+    return response
+
+
+@app.route('/meme/<int:img_id>/<int:quote_id>/<int:seed>')
+def meme_image(img_id, quote_id, seed):
+    """Stream a Random mode meme rendered in memory.
+
+    The meme key is used as the ETag, so a browser revalidating a meme it
+    already has gets a 304 without anything being rendered. The URL is
+    made of catalog indexes, which point to another meme after a reload,
+    so caches must revalidate on every use. The format follows the
+    Accept header of the request.
+
+    Returns:
+        Response: The encoded meme, or 304 Not Modified.
+    """
+    snapshot = catalog.snapshot
+    if not (0 <= img_id < len(snapshot.imgs)
+            and 0 <= quote_id < len(snapshot.quotes)
+            and 0 <= seed < LAYOUT_SEEDS):
+        abort(404)
+
+    img = snapshot.imgs[img_id]
+    quote = snapshot.quotes[quote_id]
+    profile = meme.output_profile(img, negotiate_profile())
+    key = meme.meme_key(img, quote.body, quote.author, DEFAULT_MAX_WIDTH,
+                        DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE, seed, profile)
+    if key in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        data, key = meme.render_to_bytes(
+            img, quote.body, quote.author, seed=seed, profile=profile)
+        response = app.response_class(data, mimetype=profile.mimetype)
+
+    response.set_etag(key)
+    response.vary.add('Accept')
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route('/catalog')
+def catalog_stats():
+    """Report the catalog version and reload timings.
+
+    Returns:
+        Response: JSON with the catalog statistics.
+    """
+    return jsonify(catalog.stats())
 
 
 @app.route('/create', methods=['GET'])
@@ -78,16 +184,26 @@ def meme_post():
     author = request.form.get("author")
 
     try:
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            response = requests.get(image_url)
-            response.raise_for_status()
-            f.write(response.content)
-
-        path = meme.make_meme(f.name, body, author)
-        os.remove(f.name)
-        return render_template('meme.html', path=path)
-
-    except requests.exceptions.HTTPError as e:
+        if metrics is not None:
+            with metrics.stage('fetch'):
+                image = fetcher.fetch(image_url)
+            metrics.observe_bytes('fetch', len(image.getbuffer()))
+        else:
+            image = fetcher.fetch(image_url)
+
+        profile = meme.output_profile(image, negotiate_profile())
+        if app.config['MEME_FROM_MEMORY']:
+            data, _ = meme.render_to_bytes(
+                image, body, author, profile=profile)
+            path = f'data:{profile.mimetype};base64,' + \
+                base64.b64encode(data).decode('ascii')
+        else:
+            path = meme.make_meme(image, body, author, profile=profile)
+        response = app.make_response(render_template('meme.html', path=path))
+        response.vary.add('Accept')
+        return response
+
+    except (requests.exceptions.RequestException, ImageFetchError) as e:
         logging.error(f"An error occurred in downloading the image: {str(e)}")
         return render_template('meme_form.html')
     except Exception as e:
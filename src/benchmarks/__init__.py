@@ -0,0 +1 @@
+"""Benchmarks of the meme generation pipeline."""
@@ -0,0 +1,138 @@
+"""Benchmark of animated memes, per frame and per output format.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_animation --frames 10 100 500
+
+An animated GIF of each length is generated, then rendered and encoded
+as GIF and as WebP in its own process, so that peak RSS is measured in
+isolation and shows how memory grows with the number of frames. The
+peak is read from VmHWM, which starts over with every exec, since the
+ru_maxrss of a child includes the generation of the source in the
+benchmark process. Render and encode times are reported in total and
+per frame, as JSON.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+from PIL import Image
+from EncodingProfile import PROFILES
+from MemeEngine import MemeEngine, DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE, \
+    DEFAULT_MAX_WIDTH
+from benchmarks.harness import peak_rss_kib
+
+
+def make_animation(path: str, width: int, height: int,
+                   frames: int) -> None:
+    """
+    Write a synthetic animated GIF.
+
+    Args:
+        path (str): The path of the GIF to write.
+        width (int): The width of the frames.
+        height (int): The height of the frames.
+        frames (int): The number of frames.
+    """
+    gradient = Image.linear_gradient('L').resize((width, height))
+    images = (Image.merge('RGB', (gradient.rotate(i * 360 / frames),
+                                  gradient, gradient.rotate(180)))
+              for i in range(frames))
+    first = next(images)
+    first.save(path, save_all=True, append_images=images,
+               duration=40, loop=0)
+
+
+def run_case(path: str, output: str, repeat: int, max_frames: int) -> dict:
+    """
+    Render and encode one animation several times.
+
+    Args:
+        path (str): The path of the animated GIF.
+        output (str): The name of the profile in PROFILES to encode with.
+        repeat (int): Number of timed iterations.
+        max_frames (int): The frame cap of the engine.
+
+    Returns:
+        dict: Render and encode times in total and per frame, with the
+            output size and peak RSS.
+    """
+    engine = MemeEngine(tempfile.gettempdir(), cache_bytes=0,
+                        max_frames=max_frames)
+    profile = PROFILES[output]
+    render_times = []
+    encode_times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        animation = engine.render_frames(
+            path, 'To bork or not to bork', 'Bench', DEFAULT_MAX_WIDTH,
+            DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE, key=str(i))
+        render_times.append(time.perf_counter() - start)
+
+        buffer = BytesIO()
+        start = time.perf_counter()
+        engine.encode_image(animation, buffer, profile)
+        encode_times.append(time.perf_counter() - start)
+
+    frames = len(animation.frames)
+    render_ms = min(render_times) * 1000
+    encode_ms = min(encode_times) * 1000
+    return {
+        'frames': frames,
+        'render_ms': render_ms,
+        'render_ms_per_frame': render_ms / frames,
+        'encode_ms': encode_ms,
+        'encode_ms_per_frame': encode_ms / frames,
+        'bytes': buffer.tell(),
+        'peak_rss_kib': peak_rss_kib(),
+    }
+
+
+def main():
+    """Run every animation length and output format."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', nargs='+', type=int,
+                        default=[10, 100, 300])
+    parser.add_argument('--size', default='800x600',
+                        help="frame size as WIDTHxHEIGHT")
+    parser.add_argument('--outputs', nargs='+', choices=['gif', 'webp'],
+                        default=['gif', 'webp'])
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--image', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_case(args.image, args.run, args.repeat,
+                                  args.max_frames)))
+        return
+
+    width, height = (int(v) for v in args.size.split('x'))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for frames in args.frames:
+            path = os.path.join(tmp, f'{frames}.gif')
+            make_animation(path, width, height, frames)
+
+            for output in args.outputs:
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_animation',
+                     '--run', output, '--image', path,
+                     '--repeat', str(args.repeat),
+                     '--max-frames', str(args.max_frames)],
+                    check=True, capture_output=True, text=True)
+                result = json.loads(out.stdout)
+                result.update({'source_frames': frames, 'output': output,
+                               'size': args.size})
+                results.append(result)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark of CSVIngestor against the former pandas iterrows parser.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_csv --rows 1000000
+
+The pandas based parsers are skipped if pandas is not installed.
+The results are printed as JSON.
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from QuoteEngine.CSVIngestor import CSVIngestor
+from QuoteEngine.QuoteModel import QuoteModel
+
+
+def make_corpus(path: str, rows: int) -> None:
+    """
+    Write a synthetic quote CSV with quoted fields and embedded dashes.
+
+    Args:
+        path (str): The path of the CSV file to write.
+        rows (int): The number of quotes.
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['body', 'author'])
+        for i in range(rows):
+            writer.writerow([f'Quote {i}, with a comma - and a dash',
+                             f'Author-{i % 997}'])
+
+
+def iterrows_parse(path: str) -> list:
+    """Parse the CSV the way CSVIngestor used to, with df.iterrows()."""
+    import pandas
+    quotes = []
+    df = pandas.read_csv(path, header=0)
+    for index, row in df.iterrows():
+        quotes.append(QuoteModel(row['body'], row['author']))
+    return quotes
+
+
+def vectorized_parse(path: str) -> list:
+    """Parse the CSV with CSVIngestor.parse once pandas is loaded."""
+    import pandas  # noqa: F401
+    return CSVIngestor.parse(path)
+
+
+def streaming_parse(path: str) -> list:
+    """Parse the CSV with the stdlib reader behind CSVIngestor.iter_parse."""
+    return list(CSVIngestor.iter_parse(path))
+
+
+def main():
+    """Time every available parser on a synthetic corpus."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    parsers = {'stdlib_streaming': streaming_parse}
+    try:
+        import pandas  # noqa: F401
+        parsers['pandas_iterrows'] = iterrows_parse
+        parsers['pandas_vectorized'] = vectorized_parse
+    except ImportError:
+        pass
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quotes.csv')
+        make_corpus(path, args.rows)
+
+        for name, parse in parsers.items():
+            start = time.perf_counter()
+            quotes = parse(path)
+            seconds = time.perf_counter() - start
+            assert len(quotes) == args.rows
+            assert quotes[1].body == 'Quote 1, with a comma - and a dash'
+            results.append({'parser': name, 'rows': args.rows,
+                            'seconds': seconds,
+                            'rows_per_sec': args.rows / seconds})
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark of the output encoding profiles of MemeEngine.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_encoding --repeat 10
+
+A set of memes is rendered once, from the bundled photos and from
+synthetic sources, and then encoded with every profile. For each profile
+the bytes per meme, the size relative to Pillow's default JPEG settings
+and the encode time are printed as JSON.
+"""
+import argparse
+import json
+import os
+import tempfile
+from io import BytesIO
+from EncodingProfile import EncodingProfile, PROFILES
+from ImageCatalog import ImageCatalog
+from MemeEngine import MemeEngine, DEFAULT_FONT_PATH, DEFAULT_FONT_SIZE, \
+    DEFAULT_MAX_WIDTH
+from benchmarks.bench_pipeline import make_source, make_text
+from benchmarks.harness import StageTimer, summarize
+
+BASELINE = 'jpeg_pillow_default'
+
+
+def profiles(target_bytes: list) -> dict:
+    """Return the profiles to compare, by name."""
+    compared = {BASELINE: EncodingProfile('JPEG', quality=75)}
+    compared.update(PROFILES)
+    for quality in (60, 85):
+        compared[f'jpeg_q{quality}'] = EncodingProfile(
+            'JPEG', quality=quality, progressive=True, optimize=True)
+        compared[f'webp_q{quality}'] = EncodingProfile(
+            'WEBP', quality=quality)
+    for target in target_bytes:
+        compared[f'jpeg_target_{target}'] = EncodingProfile(
+            'JPEG', quality=90, progressive=True, optimize=True,
+            target_bytes=target)
+        compared[f'webp_target_{target}'] = EncodingProfile(
+            'WEBP', quality=90, target_bytes=target)
+    return compared
+
+
+def render_memes(engine: MemeEngine, tmp: str, synthetic: int) -> list:
+    """Render the memes every profile encodes."""
+    sources = ImageCatalog('./_data/photos/dog/', index_path=None)
+    sources.refresh()
+    paths = sources.paths()
+    for i in range(synthetic):
+        path = os.path.join(tmp, f'synthetic{i}.jpg')
+        make_source(path, 2000 + 100 * i, 1500)
+        paths.append(path)
+
+    return [engine.render(path, make_text(40 + 20 * i), 'Benchmark',
+                          DEFAULT_MAX_WIDTH, DEFAULT_FONT_PATH,
+                          DEFAULT_FONT_SIZE, key=str(i))
+            for i, path in enumerate(paths)]
+
+
+def bench_profile(profile: EncodingProfile, memes: list,
+                  repeat: int) -> dict:
+    """
+    Encode every meme with one profile.
+
+    Args:
+        profile (EncodingProfile): The profile under test.
+        memes (list): The rendered memes.
+        repeat (int): Number of passes over the memes.
+
+    Returns:
+        dict: Bytes per meme and encode time summary.
+    """
+    timer = StageTimer()
+    sizes = []
+    for _ in range(repeat):
+        sizes = []
+        for image in memes:
+            buffer = BytesIO()
+            timer.time('encode', profile.encode, image, buffer)
+            sizes.append(buffer.tell())
+
+    result = summarize(timer.timings['encode'])
+    result.update({
+        'format': profile.format,
+        'bytes_mean': sum(sizes) / len(sizes),
+        'bytes_max': max(sizes),
+    })
+    return result
+
+
+def main():
+    """Encode the memes with every profile and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--synthetic', type=int, default=4,
+                        help="number of synthetic source images")
+    parser.add_argument('--target-bytes', nargs='+', type=int,
+                        default=[20000, 40000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = MemeEngine(tmp, cache_bytes=0)
+        memes = render_memes(engine, tmp, args.synthetic)
+
+    report = {name: bench_profile(profile, memes, args.repeat)
+              for name, profile in profiles(args.target_bytes).items()}
+    baseline = report[BASELINE]['bytes_mean']
+    for result in report.values():
+        result['relative_size'] = result['bytes_mean'] / baseline
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
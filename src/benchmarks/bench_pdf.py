@@ -0,0 +1,67 @@
+"""Benchmark of the PDF text extraction backends.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_pdf --files 200
+
+Each available backend parses copies of the sample quote PDF.
+The results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from QuoteEngine.PDFIngestor import PDFIngestor
+from QuoteEngine.PDFTextExtractor import PDFTextExtractor, pypdf
+
+SAMPLE = './_data/DogQuotes/DogQuotesPDF.pdf'
+
+
+def available_backends() -> list:
+    """Return the names of the backends usable on this machine."""
+    backends = []
+    if pypdf is not None:
+        backends.append('pypdf')
+    if shutil.which('pdftotext'):
+        backends.append('pdftotext')
+    return backends
+
+
+def main():
+    """Time every available backend over copies of the sample PDF."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f'quotes_{i}.pdf')
+            shutil.copyfile(SAMPLE, path)
+            paths.append(path)
+
+        for backend in available_backends():
+            PDFTextExtractor.backend = backend
+            timings = []
+            for path in paths:
+                start = time.perf_counter()
+                PDFIngestor.parse(path)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            timings.sort()
+            results.append({
+                'backend': backend,
+                'files': len(paths),
+                'mean_ms': sum(timings) / len(timings),
+                'p50_ms': timings[len(timings) // 2],
+                'max_ms': timings[-1],
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Benchmark suite for the meme rendering pipeline and the quote parsers.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_pipeline --output pipeline.json
+
+Every stage of `MemeEngine.make_meme` is timed separately over a matrix
+of source image sizes, text lengths and fonts, and every ingestor is
+timed on synthetic corpora of increasing size. The report, with p50/p99
+latency, throughput and peak memory per case, is written as JSON.
+
+Each case runs in its own process, so that its peak RSS, read from
+VmHWM, is not the peak of a larger case run before it. The Python
+allocation peak is traced in a separate pass after the timed one, since
+tracing slows down the Python-heavy stages.
+"""
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from io import BytesIO
+from PIL import Image, ImageDraw, ImageFont
+from MemeEngine import MemeEngine, DEFAULT_FONT_PATH, DEFAULT_MAX_WIDTH
+from TextLayout import TextLayoutEngine
+from QuoteEngine.TextIngestor import TextIngestor
+from QuoteEngine.CSVIngestor import CSVIngestor
+from benchmarks.harness import StageTimer, peak_rss_kib, summarize
+
+
+def make_source(path: str, width: int, height: int) -> None:
+    """Write a synthetic photo-like JPEG of the given size."""
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 64)
+    image = Image.merge('RGB', (gradient, noise, gradient.rotate(180)))
+    image.save(path, format='JPEG', quality=90)
+
+
+def make_text(length: int) -> str:
+    """Return a quote body of roughly the given number of characters."""
+    words = 'to bork or not to bork that is the question'.split()
+    text = ''
+    i = 0
+    while len(text) < length:
+        text += words[i % len(words)] + ' '
+        i += 1
+    return text[:length].strip()
+
+
+def render_stages(engine: MemeEngine, timer: StageTimer, path: str,
+                  text: str, font_path: str, font_size: int,
+                  name: str) -> None:
+    """Run every stage of rendering one meme once, timing each."""
+    author = 'Benchmark'
+    message = text + ' - ' + author
+    image = timer.time('read_image', engine.read_image,
+                       path, DEFAULT_MAX_WIDTH)
+    timer.time('decode', image.load)
+    resized = timer.time('resize_image', engine.resize_image,
+                         image, DEFAULT_MAX_WIDTH)
+
+    font = timer.time('font_load', ImageFont.truetype,
+                      font_path, size=font_size)
+    valid_width = resized.width // 2
+    timer.time('layout_cold', TextLayoutEngine().layout,
+               message, font_path, font_size, valid_width)
+    layout = timer.time('layout_cached', engine.layouts.layout,
+                        message, font_path, font_size, valid_width)
+    canvas = resized.copy()
+    draw = ImageDraw.Draw(canvas)
+    timer.time('draw', lambda: [
+        draw.text((10, 10 + layout.line_height * n), line, font=font,
+                  fill='white')
+        for n, line in enumerate(layout.lines)])
+
+    timer.time('overlay_text', engine.overlay_text, resized.copy(),
+               text, author, font_path, font_size=font_size)
+    timer.time('encode', engine.encode_image, canvas, BytesIO())
+    timer.time('save_image', engine.save_image, canvas, name)
+
+
+def bench_render_case(out_dir: str, path: str, text_length: int,
+                      font_path: str, font_size: int, repeat: int) -> dict:
+    """
+    Time every stage of rendering one meme.
+
+    Args:
+        out_dir (str): The directory the memes are saved to.
+        path (str): The source image.
+        text_length (int): The length of the quote body.
+        font_path (str): The font file.
+        font_size (int): The font size.
+        repeat (int): Number of timed iterations.
+
+    Returns:
+        dict: Summaries by stage, with the peak memory of the case.
+    """
+    engine = MemeEngine(out_dir, cache_bytes=0)
+    text = make_text(text_length)
+    timer = StageTimer()
+    for i in range(repeat):
+        render_stages(engine, timer, path, text, font_path, font_size,
+                      f'bench{i}')
+
+    tracemalloc.start()
+    render_stages(engine, StageTimer(), path, text, font_path, font_size,
+                  'traced')
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'stages': timer.summary(),
+        'python_peak_kib': traced_peak // 1024,
+        'peak_rss_kib': peak_rss_kib(),
+    }
+
+
+def run_child(case: str, **kwargs) -> dict:
+    """Run one case in a fresh process and return its result."""
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_pipeline',
+         '--run', case, '--case', json.dumps(kwargs)],
+        check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def bench_rendering(args, tmp: str) -> list:
+    """Run the rendering matrix and return one result per case."""
+    out_dir = os.path.join(tmp, 'out')
+    results = []
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split('x'))
+        path = os.path.join(tmp, f'{size}.jpg')
+        make_source(path, width, height)
+
+        for length in args.text_lengths:
+            for font_path in args.fonts:
+                for font_size in args.font_sizes:
+                    result = run_child(
+                        'render', out_dir=out_dir, path=path,
+                        text_length=length, font_path=font_path,
+                        font_size=font_size, repeat=args.repeat)
+                    result.update({
+                        'source': size, 'text_length': length,
+                        'font': os.path.basename(font_path),
+                        'font_size': font_size})
+                    results.append(result)
+    return results
+
+
+def write_corpus(path: str, kind: str, rows: int) -> None:
+    """Write a synthetic quote file of the given format."""
+    quotes = [(f'Quote number {i} is a good dog', f'Author {i % 97}')
+              for i in range(rows)]
+    if kind == 'txt':
+        with open(path, 'w', encoding='utf-8') as f:
+            for body, author in quotes:
+                f.write(f'{body} - {author}\n')
+    elif kind == 'csv':
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['body', 'author'])
+            writer.writerows(quotes)
+    elif kind == 'docx':
+        import docx
+        document = docx.Document()
+        for body, author in quotes:
+            document.add_paragraph(f'{body} - {author}')
+        document.save(path)
+
+
+def ingestors() -> dict:
+    """Return the available ingestors by file extension."""
+    available = {'txt': TextIngestor, 'csv': CSVIngestor}
+    try:
+        from QuoteEngine.DocxIngestor import DocxIngestor
+        available['docx'] = DocxIngestor
+    except ImportError:
+        pass
+    return available
+
+
+def bench_parse_case(kind: str, path: str, rows: int, repeat: int) -> dict:
+    """
+    Time one ingestor on one corpus.
+
+    Args:
+        kind (str): The extension of the corpus.
+        path (str): The corpus file.
+        rows (int): The number of quotes in the corpus.
+        repeat (int): Number of timed parses.
+
+    Returns:
+        dict: The parse time summary, throughput and peak memory.
+    """
+    ingestor = ingestors()[kind]
+    timer = StageTimer()
+    for _ in range(repeat):
+        timer.time('parse', ingestor.parse, path)
+    summary = summarize(timer.timings['parse'])
+    summary.update({
+        'rows_per_sec': rows * summary['per_sec'],
+        'peak_rss_kib': peak_rss_kib()})
+    return summary
+
+
+def bench_ingestion(args, tmp: str) -> list:
+    """Time each available ingestor on corpora of increasing size."""
+    results = []
+    for kind in ingestors():
+        for rows in args.corpus_sizes:
+            path = os.path.join(tmp, f'corpus_{rows}.{kind}')
+            write_corpus(path, kind, rows)
+            summary = run_child('parse', kind=kind, path=path, rows=rows,
+                                repeat=args.parse_repeat)
+            summary.update({'format': kind, 'rows': rows})
+            results.append(summary)
+    return results
+
+
+def main():
+    """Run the rendering and ingestion benchmarks and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+',
+                        default=['640x480', '2000x1500', '4000x3000'])
+    parser.add_argument('--text-lengths', nargs='+', type=int,
+                        default=[20, 80, 200])
+    parser.add_argument('--fonts', nargs='+', default=[DEFAULT_FONT_PATH])
+    parser.add_argument('--font-sizes', nargs='+', type=int,
+                        default=[20, 40])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--corpus-sizes', nargs='+', type=int,
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--parse-repeat', type=int, default=5)
+    parser.add_argument('--output', help="JSON file, default stdout")
+    parser.add_argument('--run', choices=['render', 'parse'],
+                        help=argparse.SUPPRESS)
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        case = bench_render_case if args.run == 'render' \
+            else bench_parse_case
+        print(json.dumps(case(**json.loads(args.case))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = {
+            'rendering': bench_rendering(args, tmp),
+            'ingestion': bench_ingestion(args, tmp),
+        }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark of JPEG draft decoding and resampling in MemeEngine.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_resize --sizes 4000x3000 6000x4000
+
+Each configuration runs in its own process so that its peak RSS is
+measured in isolation. The peak is read from VmHWM, which starts over
+with every exec, rather than from getrusage, whose ru_maxrss a child
+inherits from the benchmark process that generated the source image.
+The results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from PIL import Image
+from MemeEngine import MemeEngine, DEFAULT_MAX_WIDTH
+from benchmarks.harness import peak_rss_kib
+
+CONFIGS = {
+    'full_bicubic': (False, Image.BICUBIC),
+    'draft_bicubic': (True, Image.BICUBIC),
+    'draft_bilinear': (True, Image.BILINEAR),
+    'draft_nearest': (True, Image.NEAREST),
+}
+
+
+def make_source(path: str, width: int, height: int) -> None:
+    """
+    Write a synthetic photo-like JPEG of the given size.
+
+    Args:
+        path (str): The path of the JPEG to write.
+        width (int): The width of the image.
+        height (int): The height of the image.
+    """
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 64)
+    image = Image.merge('RGB', (gradient, noise, gradient.rotate(180)))
+    image.save(path, format='JPEG', quality=90)
+
+
+def run_config(config: str, path: str, repeat: int) -> dict:
+    """
+    Time read_image and resize_image for one configuration.
+
+    Args:
+        config (str): The name of the configuration in CONFIGS.
+        path (str): The path of the source JPEG.
+        repeat (int): Number of timed iterations.
+
+    Returns:
+        dict: Mean and best latency in ms and peak RSS in KiB.
+    """
+    draft, resample = CONFIGS[config]
+    engine = MemeEngine(tempfile.gettempdir(), cache_bytes=0,
+                        resample=resample, draft=draft)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        image = engine.read_image(path, DEFAULT_MAX_WIDTH)
+        engine.resize_image(image, DEFAULT_MAX_WIDTH).load()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'config': config,
+        'mean_ms': sum(timings) / len(timings),
+        'best_ms': min(timings),
+        'peak_rss_kib': peak_rss_kib(),
+    }
+
+
+def main():
+    """Run every configuration for every source size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['4000x3000'],
+                        help="source sizes as WIDTHxHEIGHT")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--run', choices=CONFIGS, help=argparse.SUPPRESS)
+    parser.add_argument('--image', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_config(args.run, args.image, args.repeat)))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            width, height = (int(v) for v in size.split('x'))
+            path = os.path.join(tmp, f'{size}.jpg')
+            make_source(path, width, height)
+
+            for config in CONFIGS:
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_resize',
+                     '--run', config, '--image', path,
+                     '--repeat', str(args.repeat)],
+                    check=True, capture_output=True, text=True)
+                result = json.loads(out.stdout)
+                result['source'] = size
+                results.append(result)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
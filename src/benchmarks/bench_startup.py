@@ -0,0 +1,111 @@
+"""Benchmark of the startup cost of the meme.py command-line tool.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_startup --repeat 5
+
+The CLI is run in a fresh interpreter with `python -X importtime` for
+its two main paths: a given quote (`--body/--author`), which parses no
+quote file, and a random quote, which loads the quote index. For each
+path the wall time, the total import time, the slowest top-level
+imports and whether the heavy ingestor dependencies were imported at
+all are printed as JSON.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from benchmarks.harness import summarize
+
+HEAVY_MODULES = ('docx', 'lxml', 'pandas', 'numpy', 'pypdf')
+
+PATHS = {
+    'given_quote': ['--path', './_data/photos/dog/xander_1.jpg',
+                    '--body', 'Startup benchmark', '--author', 'Bench'],
+    'random_quote': [],
+}
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse the report of `python -X importtime`.
+
+    Args:
+        stderr (str): The standard error of the interpreter.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) tuples, in the
+            order the imports finished.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us),
+                        depth))
+    return imports
+
+
+def run_path(args: list, top: int) -> dict:
+    """
+    Run the CLI once with import timing.
+
+    Args:
+        args (list): The arguments of meme.py.
+        top (int): Number of slowest top-level imports to report.
+
+    Returns:
+        dict: Wall time, import time, slowest imports and heavy modules.
+    """
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'meme.py', *args],
+        check=True, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    imports = parse_importtime(out.stderr)
+    modules = {name for name, _, _, _ in imports}
+    slowest = sorted((i for i in imports if i[3] == 0),
+                     key=lambda i: i[2], reverse=True)[:top]
+    return {
+        'wall_seconds': wall,
+        'import_ms': sum(i[1] for i in imports) / 1000,
+        'modules': len(modules),
+        'slowest': [{'module': name, 'cumulative_ms': cumulative / 1000}
+                    for name, _, cumulative, _ in slowest],
+        'heavy_modules': [name for name in HEAVY_MODULES if name in modules],
+    }
+
+
+def main():
+    """Run every CLI path several times and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paths', nargs='+', choices=PATHS,
+                        default=list(PATHS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10,
+                        help="number of slowest imports to report")
+    args = parser.parse_args()
+
+    report = {}
+    for path in args.paths:
+        runs = [run_path(PATHS[path], args.top) for _ in range(args.repeat)]
+        wall = summarize([run['wall_seconds'] for run in runs])
+        imports = summarize([run['import_ms'] / 1000 for run in runs])
+        report[path] = {
+            'wall_p50_ms': wall['p50_ms'],
+            'wall_mean_ms': wall['mean_ms'],
+            'import_p50_ms': imports['p50_ms'],
+            'modules': runs[-1]['modules'],
+            'heavy_modules': runs[-1]['heavy_modules'],
+            'slowest': runs[-1]['slowest'],
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of cached text layers against drawing captions per meme.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_text_layer --images 50 --repeat 5
+
+The same quote is put on a set of different base images, once by
+drawing every line with `ImageDraw.text` on each image and once by
+compositing the cached text layer of `MemeEngine` with a single paste.
+The first composite, which rasterizes the layer, is reported apart.
+The results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import tempfile
+from PIL import Image, ImageDraw
+from MemeEngine import MemeEngine, DEFAULT_FONT_PATH, DEFAULT_MAX_WIDTH
+from benchmarks.bench_pipeline import make_source, make_text
+from benchmarks.harness import StageTimer
+
+
+def draw_lines(engine: MemeEngine, image: Image, layout, font_path: str,
+               x: int, y: int) -> None:
+    """Draw a laid out caption line by line, as without a text layer."""
+    font = engine.fonts.get(font_path, layout.font_size)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(layout.lines):
+        draw.text((x, y + layout.line_height * i), line,
+                  font=font, fill='white')
+
+
+def bench_case(engine: MemeEngine, bases: list, text: str, font_path: str,
+               font_size: int, repeat: int) -> dict:
+    """
+    Time both ways of putting one caption on every base image.
+
+    Args:
+        engine (MemeEngine): The engine holding the text layer cache.
+        bases (list): The resized base images.
+        text (str): The caption.
+        font_path (str): The font file.
+        font_size (int): The font size.
+        repeat (int): Number of passes over the base images.
+
+    Returns:
+        dict: Summaries by method.
+    """
+    timer = StageTimer()
+    x, y = 10, 10
+    layout = engine.layouts.layout(
+        text, font_path, font_size, DEFAULT_MAX_WIDTH // 2)
+    engine.text_layers.clear()
+    timer.time('layer_render', engine.text_layer, layout, font_path)
+
+    for _ in range(repeat):
+        for base in bases:
+            canvas = base.copy()
+            timer.time('draw_text', draw_lines, engine, canvas, layout,
+                       font_path, x, y)
+            canvas = base.copy()
+            mask = timer.time('layer_lookup', engine.text_layer,
+                              layout, font_path)
+            timer.time('layer_paste', canvas.paste, 'white', (x, y), mask)
+
+    summary = timer.summary()
+    summary['speedup'] = summary['draw_text']['mean_ms'] / (
+        summary['layer_lookup']['mean_ms'] +
+        summary['layer_paste']['mean_ms'])
+    return summary
+
+
+def main():
+    """Run every text length and font size and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--images', type=int, default=20,
+                        help="number of distinct base images")
+    parser.add_argument('--text-lengths', nargs='+', type=int,
+                        default=[20, 80, 200])
+    parser.add_argument('--font', default=DEFAULT_FONT_PATH)
+    parser.add_argument('--font-sizes', nargs='+', type=int,
+                        default=[20, 40])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = MemeEngine(tmp, cache_bytes=0)
+        bases = []
+        for i in range(args.images):
+            path = os.path.join(tmp, f'{i}.jpg')
+            make_source(path, 1200 + 10 * i, 900)
+            bases.append(engine.load_base_image(path, DEFAULT_MAX_WIDTH))
+
+        for length in args.text_lengths:
+            for font_size in args.font_sizes:
+                result = bench_case(engine, bases, make_text(length),
+                                    args.font, font_size, args.repeat)
+                result.update({'text_length': length,
+                               'font_size': font_size})
+                results.append(result)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Shared helpers for timing benchmarks and summarizing the results."""
+import resource
+import time
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Return a percentile of already sorted values by nearest rank.
+
+    Args:
+        sorted_values (list): The values, sorted in ascending order.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The value at that percentile.
+    """
+    index = min(len(sorted_values) - 1,
+                max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings: list) -> dict:
+    """
+    Summarize a list of durations in seconds.
+
+    Args:
+        timings (list): The measured durations in seconds.
+
+    Returns:
+        dict: Count, mean, p50 and p99 in ms and throughput per second.
+    """
+    ordered = sorted(timings)
+    total = sum(ordered)
+    return {
+        'n': len(ordered),
+        'mean_ms': total / len(ordered) * 1000,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'per_sec': len(ordered) / total if total else float('inf'),
+    }
+
+
+def peak_rss_kib() -> int:
+    """
+    Return the peak resident set size of this process image in KiB.
+
+    ru_maxrss is inherited across fork and exec, so a benchmark child
+    would report its parent's peak; VmHWM is reset by exec.
+
+    Returns:
+        int: VmHWM from /proc/self/status, or ru_maxrss where /proc is
+            not available.
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class StageTimer:
+    """
+    Collects durations of named stages over repeated runs.
+
+    Attributes:
+        timings (dict): Lists of durations in seconds, by stage name.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty StageTimer object instance."""
+        self.timings = {}
+
+    def time(self, stage: str, func, *args, **kwargs):
+        """
+        Call a function and record its duration under a stage name.
+
+        Args:
+            stage (str): The name of the stage.
+            func (callable): The function to time.
+            *args: Positional arguments of func.
+            **kwargs: Keyword arguments of func.
+
+        Returns:
+            The return value of func.
+        """
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.timings.setdefault(stage, []).append(
+            time.perf_counter() - start)
+        return result
+
+    def summary(self) -> dict:
+        """Return the summary of every stage, by stage name."""
+        return {stage: summarize(timings)
+                for stage, timings in self.timings.items()}
@@ -1,10 +1,38 @@
 """The meme generation module."""
-import os
+import csv
 import random
 import argparse
 from QuoteEngine.Ingestor import Ingestor
+from QuoteEngine.QuoteIndex import QuoteIndex
 from QuoteEngine.QuoteModel import QuoteModel
 from MemeEngine import MemeEngine
+from ImageCatalog import ImageCatalog
+
+OUTPUT_MAX_FILES = 500
+
+
+def load_images():
+    """
+    Return the paths of the default base images.
+
+    Returns:
+        list: Paths of the images in ./_data/photos/dog/ and its
+            subdirectories.
+    """
+    images = ImageCatalog("./_data/photos/dog/")
+    images.refresh()
+    return images.paths()
+
+
+def load_quotes():
+    """
+    Return the quotes of the default quote files.
+
+    Returns:
+        list: QuoteModel objects parsed from the quote files in
+            ./_data/DogQuotes/, listed the same way as by the web app.
+    """
+    return QuoteIndex().load(Ingestor.list_files('./_data/DogQuotes/'))
 
 
 def generate_meme(path=None, body=None, author=None):
@@ -23,25 +51,12 @@ def generate_meme(path=None, body=None, author=None):
     quote = None
 
     if path is None:
-        images = "./_data/photos/dog/"
-        imgs = []
-        for root, dirs, files in os.walk(images):
-            imgs = [os.path.join(root, name) for name in files]
-
-        img = random.choice(imgs)
+        img = random.choice(load_images())
     else:
         img = path
 
     if body is None:
-        quote_files = ['./_data/DogQuotes/DogQuotesTXT.txt',
-                       './_data/DogQuotes/DogQuotesDOCX.docx',
-                       './_data/DogQuotes/DogQuotesPDF.pdf',
-                       './_data/DogQuotes/DogQuotesCSV.csv']
-        quotes = []
-        for f in quote_files:
-            quotes.extend(Ingestor.parse(f))
-
-        quote = random.choice(quotes)
+        quote = random.choice(load_quotes())
     else:
         if author is None:
             raise Exception('Author Required if Body is Used')
@@ -51,9 +66,58 @@ def generate_meme(path=None, body=None, author=None):
     print(img)
 
     path = meme.make_meme(img, quote.body, quote.author)
+    retention = meme.enable_retention(
+        max_files=OUTPUT_MAX_FILES, background=False)
+    retention.run_once()
     return path
 
 
+def generate_memes(batch_path, workers=None):
+    """
+    Generate a batch of memes described by a CSV file.
+
+    The CSV file has the columns path, body and author, with the same
+    meaning as the CLI arguments. Empty cells are filled at random.
+    Args:
+        batch_path (str): Path to the CSV file of jobs.
+        workers (int): Number of worker processes.
+
+    Yields:
+        str: Path to each generated meme image, as it finishes.
+    """
+    with open(batch_path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    imgs = None
+    quotes = None
+    jobs = []
+    for row in rows:
+        img = row.get('path') or None
+        body = row.get('body') or None
+        author = row.get('author') or None
+
+        if img is None:
+            if imgs is None:
+                imgs = load_images()
+            img = random.choice(imgs)
+
+        if body is None:
+            if quotes is None:
+                quotes = load_quotes()
+            quote = random.choice(quotes)
+        else:
+            if author is None:
+                raise Exception('Author Required if Body is Used')
+            quote = QuoteModel(body, author)
+
+        jobs.append({'img_path': img, 'text': quote.body,
+                     'author': quote.author})
+
+    meme = MemeEngine('./tmp')
+    for job, path in meme.make_memes(jobs, workers=workers):
+        yield path
+
+
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Generate Motivational Meme.")
@@ -62,6 +126,14 @@ if __name__ == "__main__":
                         help="quote body to add to the image")
     parser.add_argument('--author', type=str,
                         help="quote author to add to the image")
+    parser.add_argument('--batch', type=str,
+                        help="CSV file of path,body,author jobs to render")
+    parser.add_argument('--workers', type=int,
+                        help="number of worker processes for --batch")
 
     args = parser.parse_args()
-    print(generate_meme(args.path, args.body, args.author))
+    if args.batch:
+        for path in generate_memes(args.batch, args.workers):
+            print(path)
+    else:
+        print(generate_meme(args.path, args.body, args.author))
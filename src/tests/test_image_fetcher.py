@@ -0,0 +1,191 @@
+"""Tests of ImageFetcher against a local HTTP server.
+
+Run from the src directory:
+
+    python -m unittest discover tests
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import sys
+import time
+import unittest
+import requests
+from FetchCache import FetchCache
+from ImageFetcher import ImageFetcher, ImageFetchError
+
+BODY = b'\x89PNG' + bytes(range(256)) * 4
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves canned image responses and counts the requests by path."""
+
+    protocol_version = 'HTTP/1.1'
+    requests_seen = {}
+
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+    def send_body(self, body: bytes, headers: dict = None) -> None:
+        """Send a 200 response with a Content-Length."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunks(self, chunks, delay: float = 0) -> None:
+        """Send a 200 response with chunked encoding and no length."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.flush()
+            time.sleep(delay)
+        self.wfile.write(b'0\r\n\r\n')
+
+    def send_trickle(self, body: bytes, delay: float) -> None:
+        """Send a 200 response with a Content-Length, a byte at a time."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        for i in range(len(body)):
+            self.wfile.write(body[i:i + 1])
+            self.wfile.flush()
+            time.sleep(delay)
+
+    def do_GET(self):
+        """Answer according to the path."""
+        seen = StandInHandler.requests_seen
+        seen[self.path] = seen.get(self.path, 0) + 1
+
+        if self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            else:
+                self.send_body(BODY, {'ETag': '"v1"',
+                                      'Cache-Control': 'no-cache'})
+        elif self.path == '/max-age':
+            self.send_body(BODY, {'Cache-Control': 'max-age=60'})
+        elif self.path == '/no-store':
+            self.send_body(BODY, {'Cache-Control': 'no-store',
+                                  'ETag': '"v1"'})
+        elif self.path == '/declared-too-big':
+            self.send_body(bytes(4096))
+        elif self.path == '/streamed-too-big':
+            self.send_chunks([bytes(512)] * 8)
+        elif self.path == '/slow':
+            self.send_chunks([bytes(16)] * 10, delay=0.1)
+        elif self.path == '/slow-length':
+            self.send_trickle(bytes(200), delay=0.05)
+        else:
+            self.send_error(404)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """A threaded server that ignores clients hanging up mid-response."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Report errors other than connections dropped by the client."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class ImageFetcherTest(unittest.TestCase):
+    """Byte cap, deadline and caching behaviour of ImageFetcher."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the stand-in server on a free port."""
+        cls.server = StandInServer(('127.0.0.1', 0), StandInHandler)
+        cls.thread = Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the stand-in server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Create a fetcher with a small byte cap and a fresh cache."""
+        StandInHandler.requests_seen.clear()
+        self.cache = FetchCache()
+        self.fetcher = ImageFetcher(max_bytes=2048, deadline=0.5,
+                                    cache=self.cache)
+
+    def tearDown(self):
+        """Close the fetcher's connections."""
+        self.fetcher.close()
+
+    def test_fetch_returns_body_at_start(self):
+        """A small image is returned in full, positioned at offset 0."""
+        image = self.fetcher.fetch(self.base_url + '/max-age')
+        self.assertEqual(image.tell(), 0)
+        self.assertEqual(image.read(), BODY)
+
+    def test_declared_length_over_cap(self):
+        """A Content-Length above the cap fails before the body is read."""
+        with self.assertRaises(ImageFetchError):
+            self.fetcher.fetch(self.base_url + '/declared-too-big')
+
+    def test_streamed_body_over_cap(self):
+        """A body without a length is cut off once it passes the cap."""
+        with self.assertRaises(ImageFetchError):
+            self.fetcher.fetch(self.base_url + '/streamed-too-big')
+
+    def test_deadline(self):
+        """A body trickling in slower than the deadline is abandoned."""
+        with self.assertRaises(ImageFetchError):
+            self.fetcher.fetch(self.base_url + '/slow')
+
+    def test_deadline_with_content_length(self):
+        """A slow body with a length is abandoned at the deadline too."""
+        start = time.monotonic()
+        with self.assertRaises(ImageFetchError):
+            self.fetcher.fetch(self.base_url + '/slow-length')
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_error_status(self):
+        """An error status raises a requests exception."""
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.fetcher.fetch(self.base_url + '/missing')
+
+    def test_max_age_served_from_cache(self):
+        """A fresh response is reused without contacting the server."""
+        first = self.fetcher.fetch(self.base_url + '/max-age').read()
+        second = self.fetcher.fetch(self.base_url + '/max-age').read()
+        self.assertEqual(first, second)
+        self.assertEqual(StandInHandler.requests_seen['/max-age'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_revalidation_with_304(self):
+        """A stale response is revalidated and its body reused on 304."""
+        self.fetcher.fetch(self.base_url + '/etag')
+        image = self.fetcher.fetch(self.base_url + '/etag')
+        self.assertEqual(image.read(), BODY)
+        self.assertEqual(StandInHandler.requests_seen['/etag'], 2)
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['revalidations'], 1)
+
+    def test_no_store_not_cached(self):
+        """A response marked no-store is downloaded every time."""
+        self.fetcher.fetch(self.base_url + '/no-store')
+        self.fetcher.fetch(self.base_url + '/no-store')
+        self.assertEqual(StandInHandler.requests_seen['/no-store'], 2)
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()